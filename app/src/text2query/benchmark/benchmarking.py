@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 import sys
 
@@ -9,6 +10,8 @@ from text2query.benchmark.pipeline import (
     check_database_readiness,
     setup_database,
     generate_answers,
+    invalidate_stale_answers,
+    load_schema_string,
 )
 from text2query.benchmark.runner import (
     run_llm_generation,
@@ -20,8 +23,34 @@ from text2query.benchmark.reporting import (
     archive_session,
     model_slug,
 )
+from text2query.benchmark.validation import list_stems
+from text2query.database.schema import close_all_engines
 
 
+def _server_data_dir(data_dir: Path, server_root: str | None) -> str | None:
+    """Map a local data dir under benchmark/.tpch/data to the DB server's mount."""
+    if not server_root:
+        return None
+    try:
+        rel = data_dir.resolve().relative_to(Path("benchmark/.tpch/data").resolve())
+    except ValueError:
+        print(f"  ⚠ {data_dir} is not under benchmark/.tpch/data, loading client-side")
+        return None
+    return f"{server_root.rstrip('/')}/{rel.as_posix()}" if rel.parts else server_root
+
+
+def _execution_errors(
+    generation_results: list[dict], execution_results: list[dict],
+) -> dict[tuple[int | None, str], str]:
+    """(seed, query_id) -> error for generated queries that failed to execute this run."""
+    executed = [
+        {**r["execution"], "seed": r.get("seed")} for r in generation_results if "execution" in r
+    ]
+    return {
+        (r.get("seed"), r["query_id"]): r["error"]
+        for r in executed + execution_results
+        if r["status"] == "error"
+    }
 
 
 def _run_single_model_benchmark(
@@ -36,8 +65,14 @@ def _run_single_model_benchmark(
     seeds: list[int] | None,
     multi_model: bool,
     query_ids: list[str] | None = None,
+    answers_future: Future | None = None,
+    schema: str | None = None,
 ) -> tuple[Path, list[dict]]:
-    """Run the full benchmark (generate + execute + report) for one model."""
+    """Run the full benchmark (generate + execute + report) for one model.
+
+    answers_future, if given, is the background ground-truth answer
+    generation; it is awaited only before reporting.
+    """
     if multi_model:
         slug = model_slug(model)
         output_dir = output_base / slug
@@ -52,20 +87,26 @@ def _run_single_model_benchmark(
     print(f"\n--- LLM SQL Generation (model: {model}{seed_info}) ---\n")
 
     print("Generate SQL Queries via LLM")
-    run_llm_generation(
+    generation_results = run_llm_generation(
         questions_dir=questions_dir, output_dir=output_dir,
         db_url=db_url, model=model,
-        seeds=seeds, query_ids=query_ids,
+        seeds=seeds, query_ids=query_ids, schema=schema,
+        answers_dir=generated_answers_dir,
     )
     print()
 
     print("Execute LLM-Generated Queries")
-    execute_generated_queries(
+    execution_results = execute_generated_queries(
         queries_dir=output_dir, answers_dir=generated_answers_dir, db_url=db_url,
         seeds=seeds, query_ids=query_ids,
     )
     print()
 
+    if answers_future is not None:
+        if not answers_future.done():
+            print("Waiting for ground-truth answers...\n")
+        answers_future.result()
+
     print("Generate Reports")
     _, results = generate_reports(
         generated_queries_dir=output_dir, reference_queries_dir=queries_dir,
@@ -74,6 +115,7 @@ def _run_single_model_benchmark(
         seeds=seeds,
         model=model,
         selected_ids=query_ids,
+        exec_errors=_execution_errors(generation_results, execution_results),
     )
     print()
 
@@ -86,6 +128,9 @@ def main():
         DEFAULT_MODEL,
         BENCHMARK_SCALE_FACTOR,
         BENCHMARK_DATA_PATH,
+        BENCHMARK_SERVER_DATA_ROOT,
+        BENCHMARK_COPY_SLICES,
+        BENCHMARK_BINARY_COPY,
         BENCHMARK_NUM_SEEDS,
         BENCHMARK_MODELS,
         BENCHMARK_QUERY_IDS,
@@ -105,6 +150,7 @@ def main():
     models = BENCHMARK_MODELS if BENCHMARK_MODELS else [DEFAULT_MODEL]
     multi_model = len(models) > 1
 
+    answers_future = None
     try:
         # === Phase 1: Setup (shared across all models) ===
         print("\n--- Setup & Validation ---\n")
@@ -112,7 +158,7 @@ def main():
         # Resolve and validate query ID filter against available queries
         query_ids: list[str] | None = None
         if BENCHMARK_QUERY_IDS is not None:
-            available = sorted(f.stem for f in queries_dir.glob("*.sql"))
+            available = list_stems(queries_dir, "sql")
             valid = [q for q in BENCHMARK_QUERY_IDS if q in available]
             skipped = [q for q in BENCHMARK_QUERY_IDS if q not in available]
             if skipped:
@@ -134,7 +180,7 @@ def main():
         print()
 
         print("Validate Questions & Queries")
-        validate_directories(questions_dir, queries_dir)
+        total_questions, total_gt = validate_directories(questions_dir, queries_dir)
         print()
 
         print("Check Database Readiness")
@@ -147,15 +193,33 @@ def main():
                 schema_file=schema_file,
                 data_dir=data_dir,
                 db_url=DATABASE_URL,
-                scale_factor=BENCHMARK_SCALE_FACTOR
+                scale_factor=BENCHMARK_SCALE_FACTOR,
+                server_data_dir=_server_data_dir(data_dir, BENCHMARK_SERVER_DATA_ROOT),
+                copy_slices=BENCHMARK_COPY_SLICES,
+                binary_copy=BENCHMARK_BINARY_COPY,
             )
             print()
         else:
             print("Database already ready, skipping setup")
             print()
 
-        print("Generate Answer Files")
-        generate_answers(queries_dir=queries_dir, answers_dir=answers_dir, db_url=DATABASE_URL)
+        print("Load Schema Description")
+        schema = load_schema_string(DATABASE_URL, schema_file, Path("benchmark/.cache"))
+        print()
+
+        for cached_answers in (answers_dir, generated_answers_dir):
+            invalidate_stale_answers(cached_answers)
+
+        # Ground-truth answers only need the loaded database, so they are
+        # generated in the background while the first model is prompted.
+        # Quiet, so their per-query lines don't mix with the model's progress.
+        print("Generate Answer Files (in background)")
+        answers_pool = ThreadPoolExecutor(max_workers=1)
+        answers_future = answers_pool.submit(
+            generate_answers, queries_dir=queries_dir, answers_dir=answers_dir, db_url=DATABASE_URL,
+            quiet=True,
+        )
+        answers_pool.shutdown(wait=False)
         print()
 
         # === Phase 2+3: Per-model benchmark ===
@@ -183,6 +247,8 @@ def main():
                 seeds=seeds,
                 multi_model=multi_model,
                 query_ids=query_ids,
+                answers_future=answers_future,
+                schema=schema,
             )
             precomputed[model] = results
 
@@ -217,9 +283,6 @@ def main():
         print("=" * 60)
         print()
 
-        total_questions = len(list(questions_dir.glob("*.md")))
-        total_gt = len(list(queries_dir.glob("*.sql")))
-
         print("Summary:")
         if query_ids is not None:
             print(f"  - Queries benchmarked: {len(query_ids)} / {total_questions} ({', '.join(query_ids)})")
@@ -243,6 +306,14 @@ def main():
     except Exception as e:
         print(f"\nError: {e}", file=sys.stderr)
         return 1
+    finally:
+        # A background answer run that already started cannot be cancelled;
+        # wait for it so the engine isn't disposed under its queries.
+        if answers_future is not None and not answers_future.cancel():
+            answers_future.exception()
+        # Every step shares the cached engine for DATABASE_URL; close its
+        # pooled connections so no idle backends outlive the run.
+        close_all_engines()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,56 @@
+import glob
+import io
 import os
-import subprocess
+import shlex
+import struct
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import date
 from pathlib import Path
-from sqlalchemy import text
+from sqlalchemy import (
+    DOUBLE_PRECISION, REAL, BigInteger, Date, Float, Integer, Numeric, SmallInteger, String,
+    inspect, text,
+)
 
 TPCH_TABLES = [
     'region', 'nation', 'part', 'supplier',
     'customer', 'partsupp', 'orders', 'lineitem',
 ]
 
+# Tables grouped by FK dependency: every table only references tables from
+# earlier waves, so the tables within one wave can be loaded concurrently.
+TPCH_LOAD_WAVES = [
+    ['region', 'nation'],
+    ['part', 'supplier', 'customer'],
+    ['partsupp', 'orders'],
+    ['lineitem'],
+]
+
+# Tables large enough that a single COPY stream becomes the bottleneck; their
+# .tbl files are split at line boundaries and loaded over several connections.
+LARGE_TABLES = {'lineitem', 'orders', 'partsupp'}
+
+LOAD_WORKERS = min(len(TPCH_TABLES), os.cpu_count() or 1)
+COPY_SLICES = max(1, (os.cpu_count() or 2) // 2)
+MIN_SLICE_BYTES = 16 * 1024 * 1024
+# Below this size a table is loaded together with the other small tables
+SMALL_TABLE_BYTES = 100 * 1024 * 1024
+COPY_BUFSIZE = 1024 * 1024
+
+# SET LOCAL tunables for the load and index-rebuild transactions. Up to
+# LOAD_WORKERS index builds can run at once, so memory is sized per worker.
+SESSION_TUNING = {
+    "maintenance_work_mem": "1GB",
+    "work_mem": "256MB",
+    "max_parallel_maintenance_workers": "4",
+}
+# Server-wide checkpoint settings raised for the duration of the load
+SYSTEM_TUNING = {
+    "checkpoint_timeout": "1h",
+    "max_wal_size": "16GB",
+}
+
 
 def _fmt_size(nbytes: int) -> str:
     for unit in ('B', 'KB', 'MB', 'GB'):
@@ -17,57 +60,633 @@ def _fmt_size(nbytes: int) -> str:
     return f"{nbytes:.1f} TB"
 
 
+class _StripTrailingPipe(io.RawIOBase):
+    """Read a .tbl file (or `limit` bytes of it) with each line's trailing '|' removed."""
+
+    def __init__(self, f, limit: int | None = None):
+        self._f = f
+        self._remaining = limit
+        self._carry = b""
+        self._pending = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def _read_raw(self, n: int) -> bytes:
+        if self._remaining is not None:
+            n = min(n, self._remaining)
+        data = self._f.read(n) if n > 0 else b""
+        if self._remaining is not None:
+            self._remaining -= len(data)
+        return data
+
+    def readinto(self, buf) -> int:
+        while not self._pending and not self._eof:
+            chunk = self._read_raw(len(buf))
+            data = self._carry + chunk
+            self._carry = b""
+            if not chunk:
+                # A final line without newline keeps its '|' in the carry
+                self._eof = True
+                data = data[:-1] if data.endswith(b"|") else data
+            elif data.endswith(b"|"):
+                # The matching newline may start the next chunk
+                self._carry = b"|"
+                data = data[:-1]
+            self._pending = data.replace(b"|\n", b"\n")
+
+        n = min(len(buf), len(self._pending))
+        buf[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
+
+
+_PG_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_PG_COPY_TRAILER = struct.pack(">h", -1)
+_PG_EPOCH_ORDINAL = date(2000, 1, 1).toordinal()
+_NULL_FIELD = struct.pack(">i", -1)
+
+
+def _encode_numeric(value: bytes) -> bytes:
+    """Encode a decimal literal in PostgreSQL's binary NUMERIC layout."""
+    text_value = value.decode()
+    sign = 0x0000
+    if text_value[0] in "+-":
+        sign = 0x4000 if text_value[0] == "-" else 0x0000
+        text_value = text_value[1:]
+    int_part, _, frac_part = text_value.partition(".")
+    dscale = len(frac_part)
+
+    int_part = int_part.lstrip("0")
+    int_part = int_part.zfill(-(-len(int_part) // 4) * 4)
+    frac_part = frac_part.ljust(-(-len(frac_part) // 4) * 4, "0")
+    digits = [int(int_part[i:i + 4]) for i in range(0, len(int_part), 4)]
+    weight = len(digits) - 1
+    digits += [int(frac_part[i:i + 4]) for i in range(0, len(frac_part), 4)]
+
+    while digits and digits[0] == 0:
+        digits.pop(0)
+        weight -= 1
+    while digits and digits[-1] == 0:
+        digits.pop()
+    if not digits:
+        sign, weight = 0x0000, 0
+
+    return struct.pack(f">hhHH{len(digits)}h", len(digits), weight, sign, dscale, *digits)
+
+
+def _encode_date(value: bytes) -> bytes:
+    return struct.pack(">i", date.fromisoformat(value.decode()).toordinal() - _PG_EPOCH_ORDINAL)
+
+
+def _binary_encoders(engine, table: str) -> list[Callable[[bytes], bytes]]:
+    """Per-column encoders from .tbl text fields to binary COPY payloads."""
+    encoders = []
+    for col in inspect(engine).get_columns(table):
+        col_type = col["type"]
+        # Subclasses first: SmallInteger/BigInteger are Integers, Float is a Numeric
+        if isinstance(col_type, BigInteger):
+            encoders.append(lambda v: struct.pack(">q", int(v)))
+        elif isinstance(col_type, SmallInteger):
+            encoders.append(lambda v: struct.pack(">h", int(v)))
+        elif isinstance(col_type, Integer):
+            encoders.append(lambda v: struct.pack(">i", int(v)))
+        elif isinstance(col_type, REAL):
+            encoders.append(lambda v: struct.pack(">f", float(v)))
+        elif isinstance(col_type, DOUBLE_PRECISION):
+            encoders.append(lambda v: struct.pack(">d", float(v)))
+        elif isinstance(col_type, Float):
+            raise ValueError(f"No binary COPY encoder for {table}.{col['name']} ({col_type})")
+        elif isinstance(col_type, Numeric):
+            encoders.append(_encode_numeric)
+        elif isinstance(col_type, Date):
+            encoders.append(_encode_date)
+        elif isinstance(col_type, String):
+            encoders.append(bytes)
+        else:
+            raise ValueError(f"No binary COPY encoder for {table}.{col['name']} ({col_type})")
+    return encoders
+
+
+def _binary_path(tbl_file: Path, byte_range: tuple[int, int] | None) -> Path:
+    suffix = f".{byte_range[0]}-{byte_range[1]}.bin" if byte_range else ".bin"
+    return tbl_file.with_name(tbl_file.name + suffix)
+
+
+def _prune_binary_cache(tbl_file: Path, ranges: list[tuple[int, int] | None]) -> None:
+    """Remove cached conversions of tbl_file other than those for `ranges`.
+
+    Range files are named by byte offsets, so a different slice count or file
+    size leaves the previous set behind.
+    """
+    keep = {_binary_path(tbl_file, r) for r in ranges}
+    for path in tbl_file.parent.glob(glob.escape(tbl_file.name) + "*.bin"):
+        if path not in keep:
+            path.unlink(missing_ok=True)
+
+
+def _tbl_to_binary(
+    tbl_file: Path,
+    encoders: list[Callable[[bytes], bytes]],
+    byte_range: tuple[int, int] | None = None,
+) -> Path:
+    """Convert a .tbl file (or a byte range of it) to binary COPY format, cached on disk."""
+    bin_path = _binary_path(tbl_file, byte_range)
+    if bin_path.exists() and bin_path.stat().st_mtime >= tbl_file.stat().st_mtime:
+        return bin_path
+
+    tmp_path = bin_path.with_name(bin_path.name + ".tmp")
+    field_count = struct.pack(">h", len(encoders))
+    with open(tbl_file, "rb") as src, open(tmp_path, "wb") as dst:
+        limit = None
+        if byte_range is not None:
+            src.seek(byte_range[0])
+            limit = byte_range[1] - byte_range[0]
+        reader = io.BufferedReader(_StripTrailingPipe(src, limit), COPY_BUFSIZE)
+
+        dst.write(_PG_COPY_HEADER)
+        for line_no, line in enumerate(reader, 1):
+            fields = line.rstrip(b"\n").split(b"|")
+            if len(fields) != len(encoders):
+                dst.close()
+                tmp_path.unlink()
+                where = f" (range starting at byte {byte_range[0]})" if byte_range else ""
+                raise ValueError(
+                    f"{tbl_file.name} line {line_no}{where}: "
+                    f"{len(fields)} fields, expected {len(encoders)}"
+                )
+            row = [field_count]
+            for encode, field in zip(encoders, fields):
+                if field:
+                    payload = encode(field)
+                    row.append(struct.pack(">i", len(payload)))
+                    row.append(payload)
+                else:
+                    row.append(_NULL_FIELD)
+            dst.write(b"".join(row))
+        dst.write(_PG_COPY_TRAILER)
+
+    os.replace(tmp_path, bin_path)
+    return bin_path
+
+
+def _split_ranges(tbl_file: Path, size: int, parts: int) -> list[tuple[int, int]]:
+    """Split a file into up to `parts` byte ranges that end on line boundaries."""
+    bounds = [0]
+    with open(tbl_file, "rb") as f:
+        for i in range(1, parts):
+            f.seek(max(size * i // parts - 1, bounds[-1]))
+            f.readline()
+            pos = f.tell()
+            if pos >= size:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _drop_indexes_and_fks(
+    conn,
+    tables: list[str],
+) -> tuple[dict[str, list[str]], dict[str, list[tuple[str, str]]]]:
+    """Drop keys, indexes and foreign keys of `tables` ahead of a bulk load.
+
+    Returns (index_ddl, fk_defs): per table, the statements recreating its
+    primary/unique keys and indexes, and its (name, definition) FK pairs.
+    """
+    params = {"tables": list(tables)}
+    fk_rows = conn.execute(text(
+        "SELECT t.relname, format('%I', c.conname), pg_get_constraintdef(c.oid) "
+        "FROM pg_constraint c JOIN pg_class t ON t.oid = c.conrelid "
+        "WHERE c.contype = 'f' AND t.relname = ANY(:tables) AND pg_table_is_visible(t.oid) "
+        "ORDER BY t.relname, c.conname"
+    ), params).fetchall()
+    key_rows = conn.execute(text(
+        "SELECT t.relname, format('%I', c.conname), pg_get_constraintdef(c.oid) "
+        "FROM pg_constraint c JOIN pg_class t ON t.oid = c.conrelid "
+        "WHERE c.contype IN ('p', 'u') AND t.relname = ANY(:tables) AND pg_table_is_visible(t.oid) "
+        "ORDER BY t.relname, c.conname"
+    ), params).fetchall()
+    index_rows = conn.execute(text(
+        "SELECT t.relname, i.indexrelid::regclass::text, pg_get_indexdef(i.indexrelid) "
+        "FROM pg_index i JOIN pg_class t ON t.oid = i.indrelid "
+        "WHERE t.relname = ANY(:tables) AND pg_table_is_visible(t.oid) "
+        "  AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid) "
+        "ORDER BY t.relname, 2"
+    ), params).fetchall()
+
+    index_ddl: dict[str, list[str]] = {}
+    fk_defs: dict[str, list[tuple[str, str]]] = {}
+
+    # FKs first: they depend on the referenced tables' primary keys
+    for table, name, definition in fk_rows:
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+        fk_defs.setdefault(table, []).append((name, definition))
+    for table, name, definition in key_rows:
+        conn.execute(text(f"ALTER TABLE {table} DROP CONSTRAINT {name}"))
+        index_ddl.setdefault(table, []).append(
+            f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}"
+        )
+    for table, name, definition in index_rows:
+        conn.execute(text(f"DROP INDEX {name}"))
+        index_ddl.setdefault(table, []).append(definition)
+
+    return index_ddl, fk_defs
+
+
+@contextmanager
+def _begin(engine, settings: dict[str, str]) -> Iterator:
+    """engine.begin() with `settings` applied via SET LOCAL."""
+    with engine.begin() as conn:
+        for name, value in settings.items():
+            conn.execute(text(f"SET LOCAL {name} = '{value}'"))
+        yield conn
+
+
+@contextmanager
+def _system_tuning(engine, settings: dict[str, str]) -> Iterator[None]:
+    """Temporarily apply server-wide settings via ALTER SYSTEM, restoring them on exit."""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        try:
+            rows = conn.execute(text(
+                "SELECT name, current_setting(name), "
+                "       coalesce(sourcefile LIKE '%postgresql.auto.conf', false) "
+                "FROM pg_settings WHERE name = ANY(:names)"
+            ), {"names": list(settings)}).fetchall()
+            for name, value in settings.items():
+                conn.execute(text(f"ALTER SYSTEM SET {name} = '{value}'"))
+            conn.execute(text("SELECT pg_reload_conf()"))
+        except Exception as e:
+            print(f"  ⚠ Server tuning skipped (non-fatal): {e}")
+            rows = None
+
+        try:
+            yield
+        finally:
+            if rows is not None:
+                for name, original, from_auto_conf in rows:
+                    if from_auto_conf:
+                        conn.execute(text(f"ALTER SYSTEM SET {name} = '{original}'"))
+                    else:
+                        conn.execute(text(f"ALTER SYSTEM RESET {name}"))
+                conn.execute(text("SELECT pg_reload_conf()"))
+
+
+@contextmanager
+def _empty_on_failure(engine) -> Iterator[None]:
+    """Truncate the TPC-H tables if the body raises, then re-raise.
+
+    A load that fails after its COPYs leaves full tables without keys or
+    FKs (and possibly UNLOGGED), which check_database_ready would accept.
+    Emptying them makes the next run reload the schema and data. This also
+    covers Ctrl-C, since sliced COPYs commit independently and an interrupt
+    can leave tables partly filled.
+    """
+    try:
+        yield
+    except BaseException:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(f"TRUNCATE TABLE {', '.join(TPCH_TABLES)} CASCADE"))
+        except Exception as e:
+            print(f"  ⚠ Could not empty tables after failed load: {e}", flush=True)
+        raise
+
+
+def _run_statements(engine, statements: list[str], settings: dict[str, str]) -> None:
+    with _begin(engine, settings) as conn:
+        for stmt in statements:
+            conn.execute(text(stmt))
+
+
+def _run_per_table(
+    engine,
+    executor: ThreadPoolExecutor,
+    statements: dict[str, list[str]],
+    settings: dict[str, str],
+) -> None:
+    """Run each table's statements in its own transaction, tables in parallel."""
+    futures = [
+        executor.submit(_run_statements, engine, stmts, settings)
+        for stmts in statements.values()
+    ]
+    for f in futures:
+        f.result()
+
+
+def _restore_fks(
+    engine,
+    executor: ThreadPoolExecutor,
+    fk_defs: dict[str, list[tuple[str, str]]],
+    settings: dict[str, str],
+) -> None:
+    """Re-add the FKs removed by _drop_indexes_and_fks and validate them."""
+    # Adding FKs as NOT VALID is instant; the validation scans (which only
+    # take a SHARE UPDATE EXCLUSIVE lock) can then run concurrently.
+    _run_statements(engine, [
+        f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition} NOT VALID"
+        for table, fks in fk_defs.items()
+        for name, definition in fks
+    ], settings)
+    _run_per_table(engine, executor, {
+        table: [f"ALTER TABLE {table} VALIDATE CONSTRAINT {name}" for name, _ in fks]
+        for table, fks in fk_defs.items()
+    }, settings)
+
+
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _server_copy_sql(
+    table: str,
+    tbl_file: Path,
+    server_dir: str,
+    byte_range: tuple[int, int] | None,
+    bin_path: Path | None,
+) -> str:
+    """Build a COPY that reads the data file directly on the database server."""
+    if bin_path is not None:
+        path = _sql_literal(f"{server_dir}/{bin_path.name}")
+        return f"COPY {table} FROM {path} WITH (FORMAT binary)"
+
+    server_file = shlex.quote(f"{server_dir}/{tbl_file.name}")
+    if byte_range is None:
+        program = f"sed 's/|$//' {server_file}"
+    else:
+        start, end = byte_range
+        program = f"tail -c +{start + 1} {server_file} | head -c {end - start} | sed 's/|$//'"
+    return (
+        f"COPY {table} FROM PROGRAM {_sql_literal(program)} "
+        f"WITH (FORMAT csv, DELIMITER '|', NULL '')"
+    )
+
+
+def _copy_table(
+    cur,
+    table: str,
+    tbl_file: Path,
+    byte_range: tuple[int, int] | None = None,
+    encoders: list[Callable[[bytes], bytes]] | None = None,
+    server_dir: str | None = None,
+) -> int:
+    """COPY one .tbl file (or a line-aligned byte range of it) through `cur`.
+
+    With `encoders`, the data is first converted to a cached binary COPY file.
+    With `server_dir` (the data directory as seen by the server), the server
+    reads the file itself instead of receiving it over the connection.
+    """
+    try:
+        bin_path = _tbl_to_binary(tbl_file, encoders, byte_range) if encoders is not None else None
+        if server_dir is not None:
+            cur.execute(_server_copy_sql(table, tbl_file, server_dir, byte_range, bin_path))
+        elif bin_path is not None:
+            with open(bin_path, "rb") as f:
+                cur.copy_expert(
+                    f"COPY {table} FROM STDIN WITH (FORMAT binary)",
+                    f,
+                    size=COPY_BUFSIZE,
+                )
+        else:
+            with open(tbl_file, "rb") as f:
+                limit = None
+                if byte_range is not None:
+                    start, end = byte_range
+                    f.seek(start)
+                    limit = end - start
+                cur.copy_expert(
+                    f"COPY {table} FROM STDIN WITH (FORMAT csv, DELIMITER '|', NULL '')",
+                    _StripTrailingPipe(f, limit),
+                    size=COPY_BUFSIZE,
+                )
+    except Exception as e:
+        raise RuntimeError(f"COPY failed for {table}: {e}")
+    return cur.rowcount
+
+
+def _server_copy_works(
+    engine,
+    data_dir: Path,
+    server_dir: str,
+    encoders: list[Callable[[bytes], bytes]] | None,
+) -> bool:
+    """Try a server-side COPY of region into a temp table, rolled back afterwards.
+
+    Catches what only the server can tell: a path it cannot see or read, or
+    a role without the pg_read_server_files / pg_execute_server_program roles.
+    """
+    try:
+        with engine.connect() as conn, conn.begin() as trans:
+            conn.execute(text("CREATE TEMP TABLE _copy_probe (LIKE region)"))
+            cur = conn.connection.cursor()
+            try:
+                _copy_table(cur, "_copy_probe", data_dir / "region.tbl", None, encoders, server_dir)
+            finally:
+                cur.close()
+            trans.rollback()
+    except Exception as e:
+        print(f"  ⚠ Server-side COPY unavailable, streaming from the client: {e}", flush=True)
+        return False
+    return True
+
+
+def _load_tables(
+    engine,
+    jobs: list[tuple[str, Path, tuple[int, int] | None]],
+    settings: dict[str, str],
+    encoders: dict[str, list[Callable[[bytes], bytes]]],
+    server_dir: str | None = None,
+) -> list[int]:
+    """COPY (table, file, byte_range) jobs in order within one transaction."""
+    with _begin(engine, settings) as conn:
+        cur = conn.connection.cursor()
+        try:
+            return [
+                _copy_table(cur, table, tbl_file, byte_range, encoders.get(table), server_dir)
+                for table, tbl_file, byte_range in jobs
+            ]
+        finally:
+            cur.close()
+
+
 def load_tpch_data(
     data_dir: Path,
     db_url: str,
     truncate: bool = False,
+    rebuild_indexes: bool = True,
+    binary: bool = False,
+    persistence: str = "unlogged",
+    tune_session: bool = True,
+    tune_system: bool = False,
+    server_data_dir: str | None = None,
+    analyze: bool = True,
+    copy_slices: int = COPY_SLICES,
 ) -> dict[str, int]:
     """Load .tbl files into PostgreSQL using COPY.
 
+    Tables smaller than SMALL_TABLE_BYTES are loaded first, together in one
+    transaction. The rest are loaded wave by wave (see TPCH_LOAD_WAVES), with
+    the tables of a wave copied concurrently over separate connections. Files of
+    LARGE_TABLES are additionally split into up to copy_slices line-aligned
+    slices (at least MIN_SLICE_BYTES each) that are copied in parallel. Workers
+    and slices are capped so the load never needs more connections than the
+    engine's pool (POOL_CAPACITY) can provide.
+
+    With rebuild_indexes, keys, indexes and foreign keys are dropped before
+    the COPYs and rebuilt afterwards, which is much cheaper than maintaining
+    them row by row.
+
+    With binary, each .tbl file is converted once to PostgreSQL's binary COPY
+    format (cached next to it as .bin) so the server skips text parsing on
+    every later load. The first conversion is slower than a text COPY.
+
+    With persistence="unlogged", tables are switched to UNLOGGED for the
+    COPYs and back to LOGGED before keys are rebuilt, so the data is written
+    to WAL once instead of row by row. Pass "logged" to keep WAL logging
+    throughout. Ignored without rebuild_indexes, since FKs between logged
+    and unlogged tables are not allowed.
+
+    With tune_session, load and rebuild transactions run with SESSION_TUNING.
+
+    With tune_system, the server's checkpoint settings are raised
+    (SYSTEM_TUNING) via ALTER SYSTEM until the load finishes. This changes
+    the configuration for every session on the server and requires
+    superuser, so it is off by default.
+
+    With server_data_dir (data_dir's path on the database host), COPY reads
+    the files server-side (COPY ... FROM PROGRAM / FROM file) instead of
+    streaming them through the client. This requires superuser or the
+    pg_execute_server_program / pg_read_server_files roles; if a trial COPY
+    fails, the load falls back to streaming from the client.
+
+    With analyze, every table is ANALYZEd once loaded so the first benchmark
+    queries are planned with real statistics instead of waiting on autovacuum.
+
     Returns dict mapping table names to row counts.
     """
-    from text2query.database.schema import create_engine_for_database
+    from text2query.database.schema import POOL_CAPACITY, create_engine_for_database
 
     if not data_dir.exists():
         raise FileNotFoundError(f"Data directory not found: {data_dir}")
 
-    missing = [t for t in TPCH_TABLES if not (data_dir / f"{t}.tbl").exists()]
+    # One stat per file covers both the existence check and the sizes below.
+    sizes, missing = {}, []
+    for t in TPCH_TABLES:
+        try:
+            sizes[t] = os.stat(data_dir / f"{t}.tbl").st_size
+        except FileNotFoundError:
+            missing.append(t)
     if missing:
         raise FileNotFoundError(f"Missing .tbl files: {', '.join(missing)}")
 
     engine = create_engine_for_database(db_url)
     loaded = {}
+    # Every worker holds one pooled connection (and _system_tuning one more),
+    # so more workers than the pool can serve would only time out on checkout.
+    workers = min(max(LOAD_WORKERS, copy_slices), POOL_CAPACITY - (1 if tune_system else 0))
+    copy_slices = min(copy_slices, workers)
 
-    for i, table in enumerate(TPCH_TABLES, 1):
-        tbl_file = data_dir / f"{table}.tbl"
-        size = _fmt_size(os.path.getsize(tbl_file))
-        print(f"  [{i}/{len(TPCH_TABLES)}] {table} ({size})...", end="", flush=True)
+    if persistence not in ("logged", "unlogged"):
+        raise ValueError(f"Unknown persistence: {persistence!r}")
+    unlogged = persistence == "unlogged" and rebuild_indexes
+    settings = {"synchronous_commit": "off", **(SESSION_TUNING if tune_session else {})}
 
-        with engine.begin() as conn:
-            if truncate:
-                conn.execute(text(f"TRUNCATE TABLE {table} CASCADE"))
+    index_ddl, fk_defs = {}, {}
+    with engine.begin() as conn:
+        # Truncate everything up front: a CASCADE issued mid-load could empty
+        # tables that a concurrent worker has just filled.
+        if truncate:
+            conn.execute(text(f"TRUNCATE TABLE {', '.join(TPCH_TABLES)} CASCADE"))
+        if rebuild_indexes:
+            index_ddl, fk_defs = _drop_indexes_and_fks(conn, TPCH_TABLES)
+        if unlogged:
+            for table in TPCH_TABLES:
+                conn.execute(text(f"ALTER TABLE {table} SET UNLOGGED"))
 
-            raw = conn.connection
-            cur = raw.cursor()
-            try:
-                proc = subprocess.Popen(
-                    ["sed", "s/|$//", str(tbl_file)],
-                    stdout=subprocess.PIPE,
-                )
-                cur.copy_expert(
-                    f"COPY {table} FROM STDIN WITH (FORMAT csv, DELIMITER '|', NULL '')",
-                    proc.stdout,
-                )
-                proc.wait()
-                if proc.returncode != 0:
-                    raise RuntimeError(f"sed failed with exit code {proc.returncode}")
-            except Exception as e:
-                cur.close()
-                raise RuntimeError(f"COPY failed for {table}: {e}")
+    encoders = {t: _binary_encoders(engine, t) for t in TPCH_TABLES} if binary else {}
+    if server_data_dir is not None and not _server_copy_works(
+        engine, data_dir, server_data_dir, encoders.get("region"),
+    ):
+        server_data_dir = None
 
-            loaded[table] = cur.rowcount
-            cur.close()
+    small = [t for t in TPCH_TABLES if sizes[t] < SMALL_TABLE_BYTES]
+
+    def _report(table: str, rows: int, slices: int = 1) -> None:
+        loaded[table] = rows
+        suffix = f" in {slices} slices" if slices > 1 else ""
+        print(f"  [{len(loaded)}/{len(TPCH_TABLES)}] {table} ✓ {rows:,} rows{suffix}", flush=True)
+
+    with (
+        _empty_on_failure(engine),
+        _system_tuning(engine, SYSTEM_TUNING) if tune_system else nullcontext(),
+        ThreadPoolExecutor(max_workers=workers) as executor,
+    ):
+        # Small tables: connection and transaction setup would dominate, so
+        # they share one transaction (in FK order) on a single connection.
+        if small:
+            names = ", ".join(f"{t} ({_fmt_size(sizes[t])})" for t in small)
+            print(f"  Loading {names}...", flush=True)
+            if binary:
+                for t in small:
+                    _prune_binary_cache(data_dir / f"{t}.tbl", [None])
+            counts = _load_tables(
+                engine, [(t, data_dir / f"{t}.tbl", None) for t in small],
+                settings, encoders, server_data_dir,
+            )
+            for table, rows in zip(small, counts):
+                _report(table, rows)
 
-        print(f" ✓ {loaded[table]:,} rows", flush=True)
+        for wave in TPCH_LOAD_WAVES:
+            wave = [t for t in wave if t not in small]
+            if not wave:
+                continue
+            names = ", ".join(f"{t} ({_fmt_size(sizes[t])})" for t in wave)
+            print(f"  Loading {names}...", flush=True)
+
+            futures = {}
+            for table in wave:
+                tbl_file = data_dir / f"{table}.tbl"
+                parts = min(copy_slices, max(1, sizes[table] // MIN_SLICE_BYTES)) if table in LARGE_TABLES else 1
+                ranges = _split_ranges(tbl_file, sizes[table], parts) if parts > 1 else [None]
+                if binary:
+                    _prune_binary_cache(tbl_file, ranges)
+                futures[table] = [
+                    executor.submit(
+                        _load_tables, engine, [(table, tbl_file, byte_range)],
+                        settings, encoders, server_data_dir,
+                    )
+                    for byte_range in ranges
+                ]
+
+            for table, table_futures in futures.items():
+                _report(table, sum(f.result()[0] for f in table_futures), len(table_futures))
+
+        # A failed load empties the tables (_empty_on_failure), so the next
+        # run reloads the schema and the dropped objects only need restoring
+        # on success.
+        # SET LOGGED before the key rebuild: its rewrite reindexes every
+        # index on the table, so keys built first would be built twice. FKs
+        # come last, as they cannot link logged and unlogged tables.
+        if unlogged:
+            print("  Switching tables back to LOGGED...", flush=True)
+            _run_per_table(engine, executor, {
+                table: [f"ALTER TABLE {table} SET LOGGED"] for table in TPCH_TABLES
+            }, settings)
+        if index_ddl or fk_defs:
+            print("  Rebuilding keys and foreign keys...", flush=True)
+            _run_per_table(engine, executor, index_ddl, settings)
+        if fk_defs:
+            _restore_fks(engine, executor, fk_defs, settings)
+
+        if analyze:
+            print("  Analyzing tables...", flush=True)
+            try:
+                _run_per_table(engine, executor, {
+                    table: [f"ANALYZE {table}"] for table in TPCH_TABLES
+                }, settings)
+            except Exception as e:
+                print(f"  ⚠ ANALYZE failed (non-fatal): {e}", flush=True)
 
     return loaded
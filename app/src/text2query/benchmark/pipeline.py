@@ -1,14 +1,26 @@
+import csv
+import hashlib
+import io
 import os
+import re
 import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-import pandas as pd
-from sqlalchemy import text
+from sqlalchemy import make_url, text
 
-from text2query.database.schema import create_engine_for_database
-from text2query.database.executor import execute_sql_query
+from text2query.core.config import BENCHMARK_QUERY_PARALLELISM
+from text2query.database.schema import (
+    POOL_CAPACITY,
+    create_engine_for_database,
+    get_database_schema_string,
+    invalidate_schema_cache,
+)
+from text2query.database.executor import execute_sql_to_csv
 
 from text2query.benchmark.validation import (
+    count_files,
     check_directory,
     check_database_ready,
     check_data_cache,
@@ -17,6 +29,24 @@ from text2query.benchmark.validation import (
 
 from text2query.benchmark.data_loader import load_tpch_data
 
+INDEX_BUILD_WORKERS = 4
+# The background ground-truth run and execute-as-generated query the cached
+# engine at the same time, so each gets half of its pool rather than timing
+# out on checkout.
+QUERY_WORKERS = max(1, min(BENCHMARK_QUERY_PARALLELISM, POOL_CAPACITY // 2))
+# SET LOCAL tunables for each CREATE INDEX. Up to INDEX_BUILD_WORKERS builds
+# run at once, so index builds use at most INDEX_BUILD_WORKERS x 256MB (1GB)
+# of maintenance memory and INDEX_BUILD_WORKERS parallel helpers in total.
+INDEX_TUNING = {
+    "maintenance_work_mem": "256MB",
+    "max_parallel_maintenance_workers": "1",
+}
+# Layout of the answer CSVs written by execute_sql_to_csv. 2 is COPY's CSV
+# output (booleans as t/f, where the earlier pandas output had True/False).
+ANSWER_CSV_FORMAT = "2"
+
+_SQL_COMMENT_RE = re.compile(r"'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
 
 def generate_data(scale_factor: int, output_dir: Path) -> Path:
     output_dir = output_dir or Path(f"benchmark/.tpch/data/sf{scale_factor}")
@@ -34,10 +64,14 @@ def generate_data(scale_factor: int, output_dir: Path) -> Path:
 
     print(f"  Running: uv run tpchgen-cli -s {scale_factor} --output-dir {rel_path}")
 
+    # tpchgen-cli already generates each table on all CPUs (--num-threads
+    # defaults to the CPU count), so fanning out --parts/--part processes would
+    # only oversubscribe the cores and split tables across subdirectories.
     result = subprocess.run(
         ["uv", "run", "tpchgen-cli", "-s", str(scale_factor), "--output-dir", str(rel_path)],
         cwd="benchmark/.tpch",
-        capture_output=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
         text=True,
     )
 
@@ -51,12 +85,14 @@ def generate_data(scale_factor: int, output_dir: Path) -> Path:
 def validate_directories(
     questions_dir: Path,
     queries_dir: Path
-) -> None:
+) -> tuple[int, int]:
+    """Returns (question count, query count)."""
     print("  Validating directories...")
-    check_directory(questions_dir, "md", 22)
+    n_questions = check_directory(questions_dir, "md", 22)
     print(f"  ✓ Questions: {questions_dir}")
-    check_directory(queries_dir, "sql", 22)
+    n_queries = check_directory(queries_dir, "sql", 22)
     print(f"  ✓ Queries: {queries_dir}")
+    return n_questions, n_queries
 
 
 def check_database_readiness(db_url: str) -> bool:
@@ -73,25 +109,22 @@ def _parse_schema_sql(schema_file: Path) -> list[str]:
     if not schema_file.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_file}")
 
-    raw_statements = schema_file.read_text().split(";")
-    statements = []
-    for stmt in raw_statements:
-        stmt = stmt.strip()
-        if not stmt:
-            continue
-        lines = [line for line in stmt.split("\n")
-                 if not line.strip().startswith("--")]
-        cleaned = "\n".join(lines).strip()
-        if cleaned:
-            statements.append(cleaned)
-    return statements
+    # String literals are matched (and kept) so '--' inside them survives
+    sql = _SQL_COMMENT_RE.sub(
+        lambda m: m.group(0) if m.group(0).startswith("'") else "",
+        schema_file.read_text(),
+    )
+    return [stmt.strip() for stmt in sql.split(";") if stmt.strip()]
 
 
 def setup_database(
     schema_file: Path,
     data_dir: Path,
     db_url: str,
-    scale_factor: int
+    scale_factor: int,
+    server_data_dir: str | None = None,
+    copy_slices: int | None = None,
+    binary_copy: bool = False,
 ) -> None:
     print("  Loading database schema...")
 
@@ -108,15 +141,24 @@ def setup_database(
                 "  AND pid <> pg_backend_pid()"
             ))
 
-            for statement in statements:
-                conn.execute(text(statement))
+            # One simple-query roundtrip for the whole schema; no_parameters
+            # keeps the driver from treating '%' as a placeholder.
+            conn.execution_options(no_parameters=True).exec_driver_sql(
+                ";\n".join(statements)
+            )
+        invalidate_schema_cache(engine)
         print("  ✓ Schema loaded")
     except Exception as e:
         raise RuntimeError(f"Failed to load schema: {e}")
 
-    print("  Loading TPC-H data from .tbl files...")
+    source = " (server-side)" if server_data_dir else ""
+    fmt = ", binary COPY" if binary_copy else ""
+    print(f"  Loading TPC-H data from .tbl files{source}{fmt}...")
     try:
-        loaded_counts = load_tpch_data(data_dir, db_url)
+        load_opts = {"copy_slices": copy_slices} if copy_slices else {}
+        loaded_counts = load_tpch_data(
+            data_dir, db_url, server_data_dir=server_data_dir, binary=binary_copy, **load_opts,
+        )
 
         total_rows = sum(loaded_counts.values())
         print(f"  ✓ Loaded {total_rows:,} total rows into 8 tables")
@@ -129,38 +171,107 @@ def setup_database(
     # Build indexes after loading (faster than during COPY)
     print("  Building indexes...")
     try:
-        engine = create_engine_for_database(db_url)
         indexes_file = schema_file.parent / "indexes.sql"
         if not indexes_file.exists():
             print("  ⚠ No indexes.sql found, skipping index creation")
             return
         indexes_sql = indexes_file.read_text()
         statements = [s.strip() for s in indexes_sql.split(";") if s.strip()]
-        with engine.begin() as conn:
-            for stmt in statements:
-                conn.execute(text(stmt))
-        print("  ✓ Indexes built")
+        # Each index builds in its own transaction. Plain CREATE INDEX takes a
+        # SHARE lock, which does not conflict with itself, so several indexes
+        # on the same table (lineitem has five) can build at once. CONCURRENTLY
+        # is not used: it only avoids blocking writers, of which there are none
+        # during setup, and it scans the table twice.
+        with ThreadPoolExecutor(max_workers=INDEX_BUILD_WORKERS) as executor:
+            futures = [executor.submit(_build_index, engine, stmt) for stmt in statements]
+            for f in futures:
+                f.result()
+        print(f"  ✓ Indexes built ({len(statements)})")
     except Exception as e:
         print(f"  ⚠ Index creation failed (non-fatal): {e}")
 
 
+def load_schema_string(db_url: str, schema_file: Path, cache_dir: Path) -> str:
+    """Schema description for prompts, cached on disk per schema.sql and database.
+
+    The TPC-H schema only changes when schema.sql does, so later runs read the
+    cached string instead of querying the catalog. The key covers only the
+    database's host, port and name, so credentials never reach the cache
+    directory and a password change keeps the cache valid.
+
+    This cache is for reuse across runs. setup_database reloads schema.sql
+    itself, so a reload needs no invalidation here; within a run,
+    get_database_schema_string keeps its own short-lived cache for callers
+    that query the live catalog (REPL, runner).
+    """
+    url = make_url(db_url)
+    target = f"{url.host}:{url.port}/{url.database}"
+    key = hashlib.sha256(schema_file.read_bytes() + target.encode()).hexdigest()[:16]
+    cache_file = cache_dir / f"schema_{key}.txt"
+    if cache_file.exists():
+        print(f"  ✓ Using cached schema: {cache_file}")
+        return cache_file.read_text()
+
+    engine = create_engine_for_database(db_url)
+    schema = get_database_schema_string(engine)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_file = cache_file.with_suffix(".tmp")
+    tmp_file.write_text(schema)
+    os.replace(tmp_file, cache_file)
+    print(f"  ✓ Schema cached: {cache_file}")
+    return schema
+
+
+def _build_index(engine, statement: str) -> None:
+    with engine.begin() as conn:
+        for name, value in INDEX_TUNING.items():
+            conn.execute(text(f"SET LOCAL {name} = '{value}'"))
+        conn.execute(text(statement))
+
+
+def invalidate_stale_answers(answers_dir: Path) -> None:
+    """Delete cached answer CSVs written in an older ANSWER_CSV_FORMAT.
+
+    Answers are only generated when their CSV is missing, so files in an
+    older layout would otherwise be compared against ones in the new layout.
+    """
+    marker = answers_dir / ".csv_format"
+    if marker.exists() and marker.read_text().strip() == ANSWER_CSV_FORMAT:
+        return
+    stale = list(answers_dir.rglob("*.csv")) if answers_dir.exists() else []
+    if stale:
+        print(f"  Removing {len(stale)} answer files in an older CSV format from {answers_dir}")
+        for path in stale:
+            path.unlink()
+    answers_dir.mkdir(parents=True, exist_ok=True)
+    marker.write_text(f"{ANSWER_CSV_FORMAT}\n")
+
+
 def generate_answers(
     queries_dir: Path,
     answers_dir: Path,
-    db_url: str
+    db_url: str,
+    quiet: bool = False,
 ) -> list[dict]:
+    """Execute the reference queries missing from answers_dir.
+
+    With quiet, per-query progress is not printed, for runs in the background
+    of other progress output.
+    """
     print("  Checking answer files...")
 
     is_complete, missing_ids = check_answers_completeness(answers_dir, queries_dir)
 
     if is_complete:
-        query_count = len(list(queries_dir.glob('*.sql')))
+        query_count = count_files(queries_dir, "sql")
         print(f"  ✓ All {query_count} answer files exist")
         return []
 
     print(f"  Generating {len(missing_ids)} missing answer files...")
     query_files = [queries_dir / f"{qid}.sql" for qid in sorted(missing_ids)]
-    return execute_queries_to_csv(query_files, answers_dir, db_url, write_error_csv=False)
+    return execute_queries_to_csv(
+        query_files, answers_dir, db_url, write_error_csv=False, quiet=quiet,
+    )
 
 
 def execute_queries_to_csv(
@@ -169,6 +280,7 @@ def execute_queries_to_csv(
     db_url: str,
     *,
     write_error_csv: bool = False,
+    quiet: bool = False,
 ) -> list[dict]:
     """Execute SQL files and save results as CSV.
 
@@ -177,36 +289,58 @@ def execute_queries_to_csv(
         output_dir: directory for .csv results
         db_url: database connection URL
         write_error_csv: write error CSV on failure
+        quiet: print only the summary, not per-query progress
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     engine = create_engine_for_database(db_url)
-    results = []
-
-    for i, query_file in enumerate(query_files, 1):
-        query_id = query_file.stem
-        print(f"  [{i}/{len(query_files)}] Q{query_id}...", end="", flush=True)
-
-        try:
-            sql = query_file.read_text().strip()
-            result_df = execute_sql_query(engine, sql)
-            output_file = output_dir / f"{query_id}.csv"
-
-            if isinstance(result_df, str):
-                if write_error_csv:
-                    pd.DataFrame({"ERROR": [result_df]}).to_csv(output_file, index=False)
-                print(" ✗ (error)")
-                results.append({"query_id": query_id, "status": "error", "error": result_df})
-            else:
-                result_df.to_csv(output_file, index=False)
-                print(f" ✓ ({len(result_df)} rows)")
-                results.append({"query_id": query_id, "status": "success", "rows": len(result_df)})
-
-        except Exception as e:
-            if write_error_csv:
-                output_file = output_dir / f"{query_id}.csv"
-                pd.DataFrame({"ERROR": [str(e)]}).to_csv(output_file, index=False)
-            print(" ✗ (error)")
-            results.append({"query_id": query_id, "status": "error", "error": str(e)})
+
+    # Each worker keeps one connection for all its queries, saving the pool's
+    # checkout ping and reset per query. After a failed query the connection
+    # is dropped in case it is broken. Progress is reported as queries
+    # finish, so one slow query doesn't hide the others; results are returned
+    # in the order of query_files.
+    local = threading.local()
+    opened = []
+
+    def run(query_file: Path) -> dict:
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            try:
+                conn = engine.raw_connection()
+            except Exception:
+                # Let execute_sql_to_csv report the connection error per query
+                return execute_query_to_csv(engine, query_file, output_dir, write_error_csv)
+            local.conn = conn
+            opened.append(conn)
+        result = execute_query_to_csv(engine, query_file, output_dir, write_error_csv, conn=conn)
+        if result["status"] == "error":
+            opened.remove(conn)
+            # close() would return it to the pool for the next checkout
+            conn.invalidate()
+            local.conn = None
+        return result
+
+    workers = max(1, min(QUERY_WORKERS, len(query_files)))
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(run, query_file): pos
+                for pos, query_file in enumerate(query_files)
+            }
+            by_pos = {}
+            for i, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                if not quiet:
+                    progress = f"  [{i}/{len(query_files)}] Q{result['query_id']}"
+                    if result["status"] == "success":
+                        print(f"{progress} ✓ ({result['rows']} rows)", flush=True)
+                    else:
+                        print(f"{progress} ✗ (error)", flush=True)
+                by_pos[futures[future]] = result
+    finally:
+        for conn in opened:
+            conn.close()
+    results = [by_pos[pos] for pos in sorted(by_pos)]
 
     success = sum(1 for r in results if r["status"] == "success")
     errors = sum(1 for r in results if r["status"] == "error")
@@ -220,3 +354,39 @@ def execute_queries_to_csv(
     return results
 
 
+def execute_query_to_csv(
+    engine,
+    query_file: Path,
+    output_dir: Path,
+    write_error_csv: bool,
+    conn=None,
+) -> dict:
+    """Execute one .sql file into output_dir/<id>.csv and return its result dict.
+
+    conn is an optional raw connection to reuse (see execute_sql_to_csv).
+    """
+    query_id = query_file.stem
+    output_file = output_dir / f"{query_id}.csv"
+
+    try:
+        sql = query_file.read_text().strip()
+        rows = execute_sql_to_csv(engine, sql, output_file, conn=conn)
+
+        if isinstance(rows, str):
+            if write_error_csv:
+                _write_error_csv(output_file, rows)
+            return {"query_id": query_id, "status": "error", "error": rows}
+
+        return {"query_id": query_id, "status": "success", "rows": rows}
+
+    except Exception as e:
+        if write_error_csv:
+            _write_error_csv(output_file, str(e))
+        return {"query_id": query_id, "status": "error", "error": str(e)}
+
+
+def _write_error_csv(path: Path, message: str) -> None:
+    """Write the single-cell ERROR CSV that reports treat as an execution error."""
+    buf = io.StringIO()
+    csv.writer(buf, lineterminator="\n").writerows([["ERROR"], [message]])
+    path.write_text(buf.getvalue())
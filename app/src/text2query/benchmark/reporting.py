@@ -1,12 +1,15 @@
 import csv
 import math
+import os
 import shutil
 import statistics
+from collections import Counter
 from datetime import datetime
 from pathlib import Path
 
 
 from text2query.benchmark.similarity import evaluate_query
+from text2query.benchmark.validation import list_stems
 
 
 def model_slug(model_name: str) -> str:
@@ -146,18 +149,27 @@ def generate_reports(
     seeds: list[int] | None = None,
     model: str | None = None,
     selected_ids: list[str] | None = None,
+    exec_errors: dict[tuple[int | None, str], str] | None = None,
 ) -> tuple[Path, list[dict]]:
+    """Write per-query and summary reports and return the evaluation results.
+
+    exec_errors maps (seed, query_id) to the error of generated queries that
+    failed to execute this run (seed is None for single-seed runs); those are
+    scored without re-reading their ERROR CSVs.
+    """
     if seeds and len(seeds) > 1:
         return _generate_multiseed_reports(
             generated_queries_dir, reference_queries_dir,
             generated_answers_dir, reference_answers_dir,
             report_dir, seeds, model=model, selected_ids=selected_ids,
+            exec_errors=exec_errors,
         )
     else:
         return _generate_single_reports(
             generated_queries_dir, reference_queries_dir,
             generated_answers_dir, reference_answers_dir,
             report_dir, model=model, selected_ids=selected_ids,
+            exec_errors=exec_errors,
         )
 
 
@@ -169,15 +181,19 @@ def _generate_single_reports(
     report_dir: Path,
     model: str | None = None,
     selected_ids: list[str] | None = None,
+    exec_errors: dict[tuple[int | None, str], str] | None = None,
 ) -> tuple[Path, list[dict]]:
     """Single-seed report generation."""
+    exec_errors = exec_errors or {}
     per_query_dir = report_dir / "per_query"
     per_query_dir.mkdir(parents=True, exist_ok=True)
 
-    all_ids = sorted(f.stem for f in reference_queries_dir.glob("*.sql"))
+    all_ids = list_stems(reference_queries_dir, "sql")
     query_ids = [q for q in all_ids if q in selected_ids] if selected_ids is not None else all_ids
 
     all_results = []
+    status_counts = Counter()
+    exact_matches = 0
 
     for qid in query_ids:
         sim_result = evaluate_query(
@@ -186,9 +202,12 @@ def _generate_single_reports(
             llm_csv=generated_answers_dir / f"{qid}.csv",
             gt_sql=reference_queries_dir / f"{qid}.sql",
             llm_sql=generated_queries_dir / f"{qid}.sql",
+            exec_error=exec_errors.get((None, qid)),
         )
         sim_result["seed"] = None
         all_results.append(sim_result)
+        status_counts[sim_result["status"]] += 1
+        exact_matches += sim_result.get("result_f1") == 1.0
 
         ref_sql = (reference_queries_dir / f"{qid}.sql").read_text().strip()
         llm_sql_path = generated_queries_dir / f"{qid}.sql"
@@ -223,10 +242,9 @@ def _generate_single_reports(
         print(f"  [{qid}] {status}")
 
     total = len(all_results)
-    executed = sum(1 for r in all_results if r["status"] == "ok")
-    errors = sum(1 for r in all_results if r["status"] == "exec_error")
-    not_generated = sum(1 for r in all_results if r["status"] == "missing")
-    exact_matches = sum(1 for r in all_results if r.get("result_f1") == 1.0)
+    executed = status_counts["ok"]
+    errors = status_counts["exec_error"]
+    not_generated = status_counts["missing"]
 
     model_line = f"| Model | {model} |\n" if model else ""
     summary = (
@@ -257,12 +275,14 @@ def _generate_multiseed_reports(
     seeds: list[int],
     model: str | None = None,
     selected_ids: list[str] | None = None,
+    exec_errors: dict[tuple[int | None, str], str] | None = None,
 ) -> tuple[Path, list[dict]]:
     """Generate reports aggregating multiple seed runs with statistical analysis."""
+    exec_errors = exec_errors or {}
     per_query_dir = report_dir / "per_query"
     per_query_dir.mkdir(parents=True, exist_ok=True)
 
-    all_ids = sorted(f.stem for f in reference_queries_dir.glob("*.sql"))
+    all_ids = list_stems(reference_queries_dir, "sql")
     query_ids = [q for q in all_ids if q in selected_ids] if selected_ids is not None else all_ids
 
     aggregated = []
@@ -285,6 +305,7 @@ def _generate_multiseed_reports(
                 llm_csv=seed_answers / f"{qid}.csv",
                 gt_sql=reference_queries_dir / f"{qid}.sql",
                 llm_sql=seed_queries / f"{qid}.sql",
+                exec_error=exec_errors.get((seed, qid)),
             )
             sim_result["seed"] = seed
             seed_results.append(sim_result)
@@ -366,7 +387,7 @@ def generate_cross_model_report(
     selected_ids: list[str] | None = None,
 ) -> Path:
     """Generate cross-model comparison report and CSV export."""
-    all_ids = sorted(f.stem for f in reference_queries_dir.glob("*.sql"))
+    all_ids = list_stems(reference_queries_dir, "sql")
     query_ids = [q for q in all_ids if q in selected_ids] if selected_ids is not None else all_ids
     seeds_list = seeds or [None]
     multi_seed = seeds is not None and len(seeds) > 1
@@ -528,45 +549,39 @@ def archive_session(
     session_answers = session_dir / "answers"
     session_report = session_dir / "report"
 
-    session_queries.mkdir(parents=True, exist_ok=True)
-    session_answers.mkdir(parents=True, exist_ok=True)
-
-    # Move queries — handle both flat files and seed subdirectories
-    _move_contents(queries_dir, session_queries, "queries")
-
-    # Move answers — handle both flat files and seed subdirectories
-    _move_contents(answers_dir, session_answers, "answers")
-
+    _move_dir(queries_dir, session_queries, "queries")
+    _move_dir(answers_dir, session_answers, "answers")
     if report_dir.exists():
-        shutil.copytree(str(report_dir), str(session_report), dirs_exist_ok=True)
-        shutil.rmtree(str(report_dir))
-        print(f"  Moved reports -> {session_report}")
-
-    for d in [queries_dir, answers_dir]:
-        if d.exists():
-            shutil.rmtree(str(d))
+        _move_dir(report_dir, session_report, "reports")
 
     print(f"  Session archived -> {session_dir}")
     return session_dir
 
 
-def _move_contents(src_dir: Path, dst_dir: Path, label: str) -> None:
-    """Move files and subdirectories from src to dst."""
+def _move_dir(src_dir: Path, dst_dir: Path, label: str) -> None:
+    """Move src_dir to dst_dir, with a single rename when both are on one filesystem."""
     if not src_dir.exists():
+        dst_dir.mkdir(parents=True, exist_ok=True)
         return
 
-    # Move subdirectories (model dirs, seed dirs, or any nested structure)
-    subdirs = sorted(d for d in src_dir.iterdir() if d.is_dir())
-    if subdirs:
-        for sd in subdirs:
-            target = dst_dir / sd.name
-            shutil.copytree(str(sd), str(target), dirs_exist_ok=True)
-        print(f"  Moved {len(subdirs)} dirs of {label} -> {dst_dir}")
-
-    # Move flat files (single-seed, single-model / backward compat)
-    files = list(src_dir.glob("*.sql")) + list(src_dir.glob("*.csv")) + list(src_dir.glob("*.raw"))
-    for f in files:
-        shutil.move(str(f), str(dst_dir / f.name))
-    if files:
-        print(f"  Moved {len(files)} {label} -> {dst_dir}")
-
+    dst_dir.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.rename(src_dir, dst_dir)
+        print(f"  Moved {label} -> {dst_dir}")
+    except OSError:
+        # Different filesystem, or dst_dir already has content. Hardlinks
+        # still avoid copying bytes in the second case.
+        shutil.copytree(str(src_dir), str(dst_dir), copy_function=_link_or_copy, dirs_exist_ok=True)
+        shutil.rmtree(str(src_dir))
+        print(f"  Copied {label} -> {dst_dir}")
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    # copy2 copies through os.sendfile on Linux, so the cross-filesystem case
+    # stays in the kernel as well.
+    try:
+        if os.path.lexists(dst):
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
@@ -1,9 +1,16 @@
 import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+from text2query.core.config import BENCHMARK_LLM_PARALLELISM
 from text2query.database.schema import create_engine_for_database, get_database_schema_string
 from text2query.llm.service import get_sql_from_llm_streaming
-from text2query.benchmark.pipeline import execute_queries_to_csv
+from text2query.benchmark.pipeline import QUERY_WORKERS, execute_queries_to_csv, execute_query_to_csv
+from text2query.benchmark.validation import list_stems
+
+_BUSINESS_QUESTION_RE = re.compile(r'# Business Question:\s*\n\s*"([^"]+)"')
 
 
 def run_llm_generation(
@@ -13,7 +20,15 @@ def run_llm_generation(
     model: str,
     seeds: list[int] | None = None,
     query_ids: list[str] | None = None,
+    schema: str | None = None,
+    answers_dir: Path | None = None,
 ) -> list[dict]:
+    """Generate SQL for each question. schema, if given, skips the catalog lookup.
+
+    With answers_dir, each generated query is executed into answers_dir (per
+    seed, like execute_generated_queries) as soon as the model returns it, and
+    its result dict is attached to the generation result as "execution".
+    """
     if seeds and len(seeds) > 1:
         all_results = []
         for seed in seeds:
@@ -21,6 +36,8 @@ def run_llm_generation(
             print(f"\n  --- Seed {seed} ---")
             results = _run_single_generation(
                 questions_dir, seed_dir, db_url, model, seed=seed, query_ids=query_ids,
+                schema=schema,
+                answers_dir=answers_dir / f"seed_{seed}" if answers_dir else None,
             )
             all_results.extend(
                 {**r, "seed": seed} for r in results
@@ -30,6 +47,7 @@ def run_llm_generation(
         seed = seeds[0] if seeds else None
         return _run_single_generation(
             questions_dir, output_dir, db_url, model, seed=seed, query_ids=query_ids,
+            schema=schema, answers_dir=answers_dir,
         )
 
 
@@ -40,8 +58,10 @@ def _run_single_generation(
     model: str,
     seed: int | None = None,
     query_ids: list[str] | None = None,
+    schema: str | None = None,
+    answers_dir: Path | None = None,
 ) -> list[dict]:
-    question_files = sorted(questions_dir.glob("*.md"))
+    question_files = [questions_dir / f"{q}.md" for q in list_stems(questions_dir, "md")]
     if query_ids is not None:
         question_files = [q for q in question_files if q.stem in query_ids]
     total = len(question_files)
@@ -50,7 +70,7 @@ def _run_single_generation(
 
     # Cache: skip queries whose .sql file already exists. Assumes model/prompt/schema
     # haven't changed since the file was generated — safe for resuming interrupted runs.
-    existing = {f.stem for f in output_dir.glob("*.sql")}
+    existing = set(list_stems(output_dir, "sql"))
     to_process = [q for q in question_files if q.stem not in existing]
 
     if not to_process:
@@ -61,50 +81,72 @@ def _run_single_generation(
     cache_label = f", {len(existing)} cached" if existing else ""
     print(f"  Generating {len(to_process)} queries{seed_label}{cache_label}...")
 
-    engine = create_engine_for_database(db_url)
-    schema = get_database_schema_string(engine)
+    if schema is None:
+        engine = create_engine_for_database(db_url)
+        schema = get_database_schema_string(engine)
+
+    # Read and parse every question up front, so workers only make LLM calls
+    questions = {}
+    for qfile in to_process:
+        question = _read_question(qfile)
+        if question is None:
+            print(f"  Q{qfile.stem} ⚠ no question found, skipping")
+        else:
+            questions[qfile.stem] = question
 
     results = []
+    n = len(questions)
+    if not n:
+        return results
 
-    for i, qfile in enumerate(to_process, 1):
-        query_id = qfile.stem
-        content = qfile.read_text()
-
-        match = re.search(r'# Business Question:\s*\n\s*"([^"]+)"', content)
-        if not match:
-            print(f"  [{i}/{len(to_process)}] Q{query_id}... ⚠ no question found, skipping")
-            continue
-
-        question = match.group(1)
-
-        print(f"  [{i}/{len(to_process)}] Q{query_id}...", end="", flush=True)
-
-        generated_sql = None
-        raw_response = None
-        error = None
-
-        for chunk in get_sql_from_llm_streaming(question, schema, model, seed=seed):
-            if chunk["type"] == "done":
-                generated_sql = chunk.get("sql")
-                raw_response = chunk.get("full_response")
-                break
-            elif chunk["type"] == "error":
-                error = chunk.get("message")
-                break
-
-        if generated_sql:
-            output_file = output_dir / f"{query_id}.sql"
-            output_file.write_text(generated_sql)
-            print(" ✓")
-            results.append({"query_id": query_id, "status": "success"})
-        else:
-            raw_file = output_dir / f"{query_id}.raw"
-            if error:
-                raw_file.write_text(f"ERROR: {error}\n")
-            elif raw_response:
-                raw_file.write_text(raw_response)
-            print(" ✗")
-            results.append({"query_id": query_id, "status": "error", "error": error or "No SQL extracted"})
+    # LLM calls are network-bound, so overlap them; progress is printed from
+    # this thread as each question finishes. On Ctrl-C, queued questions are
+    # dropped and running streams stop at their next token.
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=min(BENCHMARK_LLM_PARALLELISM, n))
+    # Generated queries are executed right away on a separate pool, so
+    # database work overlaps with the remaining LLM calls.
+    db_executor = None
+    exec_futures = []
+    if answers_dir is not None:
+        answers_dir.mkdir(parents=True, exist_ok=True)
+        db_engine = create_engine_for_database(db_url)
+        db_executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS)
+    try:
+        futures = [
+            executor.submit(
+                _process_question, query_id, question, schema, model, output_dir, seed, stop,
+            )
+            for query_id, question in questions.items()
+        ]
+        for i, future in enumerate(as_completed(futures), 1):
+            result = future.result()
+            query_id = result["query_id"]
+            progress = f"  [{i}/{n}] Q{query_id}"
+            print(f"{progress} {'✓' if result['status'] == 'success' else '✗'}", flush=True)
+            results.append(result)
+            if db_executor is not None and result["status"] == "success":
+                exec_futures.append(db_executor.submit(
+                    execute_query_to_csv, db_engine, output_dir / f"{query_id}.sql",
+                    answers_dir, True,
+                ))
+    except BaseException:
+        stop.set()
+        raise
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        if db_executor is not None:
+            db_executor.shutdown(wait=True, cancel_futures=stop.is_set())
+
+    results.sort(key=lambda r: r["query_id"])
+
+    if exec_futures:
+        executed = {r["query_id"]: r for r in (f.result() for f in exec_futures)}
+        ok = sum(1 for r in executed.values() if r["status"] == "success")
+        print(f"  ✓ Executed {ok}/{len(executed)} generated queries -> {answers_dir}")
+        for r in results:
+            if r["query_id"] in executed:
+                r["execution"] = executed[r["query_id"]]
 
     success = sum(1 for r in results if r["status"] == "success")
     errors = sum(1 for r in results if r["status"] == "error")
@@ -118,6 +160,59 @@ def _run_single_generation(
     return results
 
 
+def _read_question(qfile: Path) -> str | None:
+    """The business question of a question .md file, or None if it has none.
+
+    Parsed once per file version; later seeds and models reuse the result.
+    """
+    return _parse_question(qfile, qfile.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=256)
+def _parse_question(qfile: Path, mtime_ns: int) -> str | None:
+    match = _BUSINESS_QUESTION_RE.search(qfile.read_text())
+    return match.group(1) if match else None
+
+
+def _process_question(
+    query_id: str,
+    question: str,
+    schema: str,
+    model: str,
+    output_dir: Path,
+    seed: int | None = None,
+    stop_event: threading.Event | None = None,
+) -> dict:
+    """Generate SQL for one question and save it (or the raw response) in output_dir."""
+    generated_sql = None
+    raw_response = None
+    error = None
+
+    for chunk in get_sql_from_llm_streaming(
+        question, schema, model, stop_event=stop_event, seed=seed,
+    ):
+        if chunk["type"] == "done":
+            generated_sql = chunk.get("sql")
+            raw_response = chunk.get("full_response")
+            break
+        elif chunk["type"] == "error":
+            error = chunk.get("message")
+            break
+        elif chunk["type"] == "stopped":
+            return {"query_id": query_id, "status": "error", "error": "Interrupted"}
+
+    if generated_sql:
+        (output_dir / f"{query_id}.sql").write_text(generated_sql)
+        return {"query_id": query_id, "status": "success"}
+
+    raw_file = output_dir / f"{query_id}.raw"
+    if error:
+        raw_file.write_text(f"ERROR: {error}\n")
+    elif raw_response:
+        raw_file.write_text(raw_response)
+    return {"query_id": query_id, "status": "error", "error": error or "No SQL extracted"}
+
+
 def execute_generated_queries(
     queries_dir: Path,
     answers_dir: Path,
@@ -146,14 +241,14 @@ def _execute_single(
     db_url: str,
     query_ids: list[str] | None = None,
 ) -> list[dict]:
-    query_files = sorted(queries_dir.glob("*.sql"))
+    query_files = [queries_dir / f"{q}.sql" for q in list_stems(queries_dir, "sql")]
     if query_ids is not None:
         query_files = [q for q in query_files if q.stem in query_ids]
     total = len(query_files)
 
     answers_dir.mkdir(parents=True, exist_ok=True)
 
-    existing = {f.stem for f in answers_dir.glob("*.csv")}
+    existing = set(list_stems(answers_dir, "csv"))
     to_process = [q for q in query_files if q.stem not in existing]
 
     if not to_process:
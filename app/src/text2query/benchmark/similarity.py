@@ -16,13 +16,22 @@ def evaluate_query(
     llm_csv: Path,
     gt_sql: Path,
     llm_sql: Path,
+    exec_error: str | None = None,
 ) -> dict:
+    """Score one generated query against the reference.
+
+    exec_error, if the generated query is already known to have failed in
+    this run, is used instead of reading it back from the ERROR CSV.
+    """
     gt_sql_text = gt_sql.read_text() if gt_sql.exists() else ""
     llm_sql_text = llm_sql.read_text() if llm_sql.exists() else ""
 
-    status, precision, recall, f1, error_detail = _result_set_comparison(
-        gt_csv, llm_csv, ref_sql=gt_sql_text,
-    )
+    if exec_error is not None:
+        status, precision, recall, f1, error_detail = "exec_error", 0.0, 0.0, 0.0, exec_error
+    else:
+        status, precision, recall, f1, error_detail = _result_set_comparison(
+            gt_csv, llm_csv, ref_sql=gt_sql_text,
+        )
 
     error_category = None
     error_detail_text = None
@@ -135,11 +144,12 @@ def _result_set_comparison(
     if not llm_csv.exists():
         return "missing", None, None, None, None
 
-    content = llm_csv.read_text()
-    first_line = content.split("\n", 1)[0].strip()
-    if first_line == "ERROR":
-        error_detail = content.split("\n", 1)[1].strip() if "\n" in content else ""
-        return "exec_error", 0.0, 0.0, 0.0, error_detail
+    # Only the header decides whether this is an error CSV; the rest of a
+    # (possibly large) result file is left to read_csv below.
+    with open(llm_csv, encoding="utf-8") as f:
+        first_line = f.readline().strip()
+        if first_line == "ERROR":
+            return "exec_error", 0.0, 0.0, 0.0, f.read().strip()
 
     gt_df = pd.read_csv(gt_csv)
     llm_df = pd.read_csv(llm_csv)
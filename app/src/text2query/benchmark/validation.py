@@ -1,44 +1,61 @@
+import os
 from pathlib import Path
-from sqlalchemy import inspect, text
+from sqlalchemy import text
 
 from text2query.benchmark.data_loader import TPCH_TABLES
 
 
-def check_directory(directory: Path, extension: str, expected_count: int) -> None:
+def count_files(directory: Path, extension: str) -> int:
+    """Count *.extension files in a directory without building Path objects."""
+    suffix = f".{extension}"
+    with os.scandir(directory) as entries:
+        return sum(1 for e in entries if e.name.endswith(suffix) and e.is_file())
+
+
+def list_stems(directory: Path, extension: str) -> list[str]:
+    """Sorted stems of *.extension files, from one scandir pass (no per-file stat).
+
+    A missing directory yields an empty list, like Path.glob.
+    """
+    suffix = f".{extension}"
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                e.name[:-len(suffix)] for e in entries
+                if e.name.endswith(suffix) and not e.name.startswith(".") and e.is_file()
+            )
+    except FileNotFoundError:
+        return []
+
+
+def check_directory(directory: Path, extension: str, expected_count: int) -> int:
     if not directory.exists():
         raise FileNotFoundError(f"Directory not found: {directory}")
 
-    files = list(directory.glob(f"*.{extension}"))
-    if len(files) != expected_count:
+    count = count_files(directory, extension)
+    if count != expected_count:
         raise ValueError(
             f"Expected {expected_count} .{extension} files in {directory}, "
-            f"found {len(files)}"
+            f"found {count}"
         )
+    return count
 
 
 def check_database_ready(db_url: str) -> bool:
     from text2query.database.schema import create_engine_for_database
 
     engine = create_engine_for_database(db_url)
+    # One roundtrip: EXISTS stops at the first row (no COUNT(*) on large
+    # tables), and a missing table fails the query.
+    ready_sql = "SELECT " + " AND ".join(
+        f"EXISTS (SELECT 1 FROM {table})" for table in TPCH_TABLES
+    )
     try:
-        inspector = inspect(engine)
-        actual = {t.lower() for t in inspector.get_table_names()}
-        expected = {t.lower() for t in TPCH_TABLES}
-
-        if not expected.issubset(actual):
-            return False
-
-        # Fast non-empty check (avoid COUNT(*) on multi-million row tables)
         with engine.connect() as conn:
-            for table in TPCH_TABLES:
-                row = conn.execute(text(f"SELECT 1 FROM {table} LIMIT 1")).fetchone()
-                if row is None:
-                    return False
+            return bool(conn.execute(text(ready_sql)).scalar())
     except Exception:
         return False
 
-    return True
-
 
 def check_data_cache(data_dir: Path) -> bool:
     if not data_dir.exists():
@@ -53,9 +70,9 @@ def check_answers_completeness(
     answers_dir: Path,
     queries_dir: Path,
 ) -> tuple[bool, set[str]]:
-    expected = {q.stem for q in queries_dir.glob("*.sql")}
+    expected = set(list_stems(queries_dir, "sql"))
     if not answers_dir.exists():
         return False, expected
-    actual = {a.stem for a in answers_dir.glob("*.csv")}
+    actual = set(list_stems(answers_dir, "csv"))
     missing = expected - actual
     return len(missing) == 0, missing
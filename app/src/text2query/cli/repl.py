@@ -2,7 +2,11 @@
 
 import sys
 
-from text2query.database.schema import create_engine_for_database, get_database_schema_string
+from text2query.database.schema import (
+    close_all_engines,
+    create_engine_for_database,
+    get_database_schema_string,
+)
 from text2query.database.executor import execute_sql_query
 from text2query.llm.service import get_sql_from_llm_streaming, list_available_models
 from text2query.core.config import DATABASE_URL, DEFAULT_MODEL, FRONTDESK_MODEL
@@ -246,6 +250,7 @@ def main():
             except Exception as e:
                 out(f"  {FG_RED}{ERROR}{RESET} Unexpected error: {e}")
     finally:
+        close_all_engines()
         sys.stdout.write(FULL_RESET + "\n")
         sys.stdout.flush()
 
@@ -52,7 +52,10 @@ def format_table(df, max_rows=100):
     show = df.head(max_rows) if truncated else df
 
     headers = [str(c) for c in show.columns]
-    rows = [[str(v) if str(v) != "nan" else "" for v in vals] for vals in show.values]
+    rows = [
+        ["" if (s := str(v)) == "nan" else s for v in vals]
+        for vals in show.itertuples(index=False, name=None)
+    ]
 
     widths = []
     for i, h in enumerate(headers):
@@ -13,6 +13,52 @@ FRONTDESK_TEMPERATURE = 0.4
 BENCHMARK_SCALE_FACTOR = 1
 BENCHMARK_NUM_SEEDS = int(os.getenv("BENCHMARK_NUM_SEEDS", "1"))
 BENCHMARK_DATA_PATH = os.getenv("BENCHMARK_DATA_PATH")
+# Concurrent LLM requests during generation. Defaults to what the Ollama server
+# serves at once, so extra requests don't just queue there.
+BENCHMARK_LLM_PARALLELISM = max(1, int(
+    os.getenv("BENCHMARK_LLM_PARALLELISM") or os.getenv("OLLAMA_NUM_PARALLEL") or "4"
+))
+# Where the database server sees benchmark/.tpch/data; enables server-side COPY
+BENCHMARK_SERVER_DATA_ROOT = os.getenv("BENCHMARK_SERVER_DATA_ROOT")
+# Parallel COPY streams per large .tbl file; unset uses half the CPU count
+_copy_slices_raw = os.getenv("BENCHMARK_COPY_SLICES", "").strip()
+BENCHMARK_COPY_SLICES = max(1, int(_copy_slices_raw)) if _copy_slices_raw else None
+# Load .tbl files as binary COPY (converted once, cached as .bin next to them)
+BENCHMARK_BINARY_COPY = os.getenv("BENCHMARK_BINARY_COPY", "").strip().lower() in ("1", "true", "yes")
+
+
+def _available_memory() -> int | None:
+    """Bytes available for new work, counting reclaimable page cache.
+
+    Reads MemAvailable from /proc/meminfo; SC_AVPHYS_PAGES (free memory only)
+    is the fallback where that file is missing.
+    """
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _default_query_parallelism() -> int:
+    """Scale concurrent benchmark queries with available memory (8/4/2/1 at 16/8/4 GiB)."""
+    available = _available_memory()
+    if available is None:
+        return 2
+    gib = available / 2**30
+    return 8 if gib >= 16 else 4 if gib >= 8 else 2 if gib >= 4 else 1
+
+
+# Concurrent SQL executions when producing answer CSVs
+BENCHMARK_QUERY_PARALLELISM = max(
+    1, int(os.getenv("BENCHMARK_QUERY_PARALLELISM") or _default_query_parallelism())
+)
 
 _models_raw = os.getenv("BENCHMARK_MODELS", "")
 BENCHMARK_MODELS = [m.strip() for m in _models_raw.split(",") if m.strip()][:3]
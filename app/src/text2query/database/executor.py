@@ -1,16 +1,82 @@
+import re
+from pathlib import Path
+
 import pandas as pd
 from sqlalchemy import text
 
 STATEMENT_TIMEOUT_MS = 30_000
 MAX_RESULT_ROWS = 10_000
+SYNTAX_ERROR = "42601"
+
+# Statements a server-side cursor (DECLARE ... CURSOR FOR) can run
+_STREAMABLE_RE = re.compile(r"\s*\(*\s*(SELECT|WITH|VALUES|TABLE)\b", re.IGNORECASE)
 
 
+# Queries run here are parameterless and each text is executed once (LLM output,
+# TPC-H reference queries), so server-side PREPARE or plan_cache_mode would
+# only add a roundtrip: there is no plan to reuse and no generic plan to avoid.
 def execute_sql_query(engine, query: str) -> pd.DataFrame | str:
+    """Run a query and return up to MAX_RESULT_ROWS rows as a DataFrame, or an error.
+
+    Used for display (REPL) and as the fallback of execute_sql_to_csv; bulk
+    results headed for a file should go through execute_sql_to_csv instead.
+    """
     try:
         with engine.connect() as conn:
             conn.execute(text(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}"))
+            # A server-side cursor transfers only the rows fetched below; a
+            # plain cursor would pull the whole result into client memory.
+            if _STREAMABLE_RE.match(query):
+                conn = conn.execution_options(stream_results=True, max_row_buffer=MAX_RESULT_ROWS)
             result = conn.execute(text(query))
             rows = result.fetchmany(MAX_RESULT_ROWS)
-            return pd.DataFrame(rows, columns=result.keys())
+            return pd.DataFrame.from_records(rows, columns=list(result.keys()))
     except Exception as e:
         return str(e)
+
+
+def execute_sql_to_csv(engine, query: str, path: Path, conn=None) -> int | str:
+    """Run a query and write its result to `path` as CSV. Returns the row count or an error.
+
+    The result is streamed with COPY ... TO STDOUT, so rows go from the server
+    to the file without building a DataFrame. Statements COPY cannot wrap
+    (non-SELECTs, or a syntax error from several statements or a trailing
+    comment) fall back to execute_sql_query. Any other failure is returned
+    as is, so a query that failed or timed out is not run a second time.
+
+    conn, if given, is a raw connection (engine.raw_connection()) the caller
+    keeps open across queries; otherwise one is checked out per call.
+    """
+    body = query.strip().rstrip(";").rstrip()
+    copy_sql = (
+        f"COPY (SELECT * FROM (\n{body}\n) AS _q LIMIT {MAX_RESULT_ROWS}) "
+        "TO STDOUT WITH (FORMAT csv, HEADER)"
+    )
+    own_conn = conn is None
+    try:
+        if own_conn:
+            conn = engine.raw_connection()
+        try:
+            with conn.cursor() as cur, open(path, "wb") as f:
+                cur.execute(f"SET statement_timeout = {STATEMENT_TIMEOUT_MS}")
+                cur.copy_expert(copy_sql, f)
+                rows = cur.rowcount
+            conn.rollback()
+            return rows
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if own_conn:
+                conn.close()
+    except Exception as e:
+        if getattr(e, "pgcode", None) != SYNTAX_ERROR and _STREAMABLE_RE.match(query):
+            path.unlink(missing_ok=True)
+            return str(e).strip()
+
+    result_df = execute_sql_query(engine, query)
+    if isinstance(result_df, str):
+        path.unlink(missing_ok=True)
+        return result_df
+    result_df.to_csv(path, index=False)
+    return len(result_df)
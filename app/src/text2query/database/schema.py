@@ -1,20 +1,77 @@
-from sqlalchemy import create_engine, inspect, text
+import threading
+import time
+from collections.abc import Iterator
+
+from sqlalchemy import Engine, create_engine, inspect, text
+
+SCHEMA_CACHE_TTL = 300  # seconds
+# Connections one cached engine can hand out at once (pool_size + max_overflow)
+POOL_SIZE = 8
+POOL_MAX_OVERFLOW = 10
+POOL_CAPACITY = POOL_SIZE + POOL_MAX_OVERFLOW
+
+# Schema descriptions by database URL, as (time fetched, description)
+_schema_cache: dict[str, tuple[float, str]] = {}
+
+_engines: dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def _cache_key(engine) -> str:
+    return engine.url.render_as_string(hide_password=False)
+
+
+def invalidate_schema_cache(engine) -> None:
+    """Forget the cached schema description of engine's database, e.g. after DDL."""
+    _schema_cache.pop(_cache_key(engine), None)
 
 
 def get_database_schema_string(engine) -> str:
-    inspector = inspect(engine)
-    lines = []
+    """One line per table with its columns and foreign keys, cached for SCHEMA_CACHE_TTL."""
+    key = _cache_key(engine)
+    cached = _schema_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < SCHEMA_CACHE_TTL:
+        return cached[1]
+
+    schema = "\n".join(_schema_lines(inspect(engine)))
+    _schema_cache[key] = (now, schema)
+    return schema
+
+
+def _schema_lines(inspector) -> Iterator[str]:
+    # The get_multi_* calls reflect all tables in one catalog query each,
+    # instead of two queries per table.
+    columns = inspector.get_multi_columns()
+    foreign_keys = inspector.get_multi_foreign_keys()
     for table in inspector.get_table_names():
-        cols = ", ".join(f"{c['name']} ({c['type']})" for c in inspector.get_columns(table))
-        fks = [f"FK({','.join(fk['constrained_columns'])}) -> {fk['referred_table']}" 
-               for fk in inspector.get_foreign_keys(table)]
-        line = f"Table '{table}': {cols}"
-        if fks:
-            line += f". {' '.join(fks)}"
-        lines.append(line)
-    return "\n".join(lines)
+        cols = ", ".join(f"{c['name']} ({c['type']})" for c in columns.get((None, table), ()))
+        fks = " ".join(
+            f"FK({','.join(fk['constrained_columns'])}) -> {fk['referred_table']}"
+            for fk in foreign_keys.get((None, table), ())
+        )
+        yield f"Table '{table}': {cols}. {fks}" if fks else f"Table '{table}': {cols}"
 
 
 def create_engine_for_database(db_url: str):
-    return create_engine(db_url, pool_pre_ping=True, pool_size=5, max_overflow=10, pool_recycle=3600)
+    """Engine for db_url, cached so every caller shares one connection pool."""
+    # Locked so threads starting at once (answers, query pools) don't each
+    # build a pool for the same URL.
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            engine = _engines[db_url] = create_engine(
+                db_url, pool_pre_ping=True, pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW,
+                pool_recycle=1800,
+            )
+        return engine
+
+
+def close_all_engines() -> None:
+    """Dispose the pools of all cached engines, e.g. at shutdown."""
+    with _engines_lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        engine.dispose()
 
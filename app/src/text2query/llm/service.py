@@ -1,18 +1,40 @@
 import json
 import re
-from collections.abc import Generator, Callable
+import threading
+from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from text2query.core.config import (
     OLLAMA_URL, DEFAULT_MODEL,
     LLM_TEMPERATURE, LLM_MAX_TOKENS,
 )
+from text2query.llm.prompts import DEFAULT_SQL_GENERATION_TEMPLATE
+
+_SQL_START_RE = re.compile(r"(SELECT|WITH)\s+", re.IGNORECASE)
+_SQL_START_LOWER_RE = re.compile(r"(select|with)\s+")
+# Read size for the NDJSON stream. Chunked responses are still delivered as
+# each chunk arrives; a large size only keeps the final line (which carries
+# the whole token context) from being rebuilt 512 bytes at a time.
+_STREAM_CHUNK_BYTES = 64 * 1024
+
+# One keep-alive session for every Ollama call, sized for the benchmark's
+# concurrent generations, instead of a new TCP connection per request.
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_maxsize=16, max_retries=0)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# Aborts are sent in the background so a stop is reported without waiting
+# on Ollama; the pool's threads are joined at exit, so pending aborts still go out.
+_abort_pool = ThreadPoolExecutor(max_workers=2)
 
 
 def abort_ollama_generation(model: str | None = None) -> bool:
     try:
-        resp = requests.post(
+        resp = _session.post(
             f"{OLLAMA_URL}/api/generate",
             json={"model": model or DEFAULT_MODEL, "keep_alive": 0},
             timeout=5,
@@ -25,7 +47,7 @@ def abort_ollama_generation(model: str | None = None) -> bool:
 def list_available_models() -> list[str]:
     """Query Ollama for all locally available models."""
     try:
-        resp = requests.get(f"{OLLAMA_URL}/api/tags", timeout=10)
+        resp = _session.get(f"{OLLAMA_URL}/api/tags", timeout=10)
         if resp.status_code == 200:
             data = resp.json()
             return [m["name"] for m in data.get("models", [])]
@@ -41,7 +63,7 @@ def chat_with_model(
 ) -> str | None:
     """Send a chat-style request to Ollama. Returns the response text or None."""
     try:
-        resp = requests.post(
+        resp = _session.post(
             f"{OLLAMA_URL}/api/chat",
             json={
                 "model": model,
@@ -62,16 +84,18 @@ def get_sql_from_llm_streaming(
     user_query: str,
     schema_str: str,
     model: str | None = None,
-    stop_check: Callable[[], bool] | None = None,
+    stop_event: threading.Event | None = None,
     seed: int | None = None,
 ) -> Generator[dict, None, None]:
     """Stream SQL generation. Yields token/done/stopped/error dicts."""
     selected_model = model or DEFAULT_MODEL
     prompt = _build_prompt(user_query, schema_str)
     
-    full_response = ""
+    chunks: list[str] = []
+    length = 0
+    fences: list[int] = []
+    fence_carry = ""
     stopped = False
-    session = None
     response = None
 
     options = {
@@ -82,10 +106,7 @@ def get_sql_from_llm_streaming(
         options["seed"] = seed
     
     try:
-        session = requests.Session()
-        session.headers.update({"Connection": "close"})
-        
-        response = session.post(
+        response = _session.post(
             f"{OLLAMA_URL}/api/generate",
             json={
                 "model": selected_model,
@@ -105,13 +126,13 @@ def get_sql_from_llm_streaming(
             yield {"type": "error", "message": f"LLM API error: {response.status_code}"}
             return
         
-        for line in response.iter_lines():
+        for line in response.iter_lines(chunk_size=_STREAM_CHUNK_BYTES):
             # Check stop request
-            if stop_check and stop_check():
+            if stop_event is not None and stop_event.is_set():
                 stopped = True
                 response.close()
-                abort_ollama_generation(selected_model)
-                yield {"type": "stopped", "partial_response": full_response}
+                _abort_pool.submit(abort_ollama_generation, selected_model)
+                yield {"type": "stopped", "partial_response": "".join(chunks)}
                 return
             
             if not line:
@@ -121,24 +142,31 @@ def get_sql_from_llm_streaming(
                 data = json.loads(line)
                 token = data.get("response", "")
                 if token:
-                    full_response += token
+                    chunks.append(token)
+                    # Once the fenced block is closed (the usual case), later
+                    # tokens need no scanning at all.
+                    if len(fences) < 2:
+                        fence_carry = _track_fences(token, length, fence_carry, fences)
+                    length += len(token)
                     yield {"type": "token", "content": token}
                 
                 if data.get("done"):
+                    full_response = "".join(chunks)
                     yield {
                         "type": "done",
                         "full_response": full_response,
-                        "sql": _clean_sql_response(full_response),
+                        "sql": _extract_sql(full_response, fences),
                     }
                     return
             except json.JSONDecodeError:
                 continue
         
         # Stream ended without "done" - return what we have
+        full_response = "".join(chunks)
         yield {
             "type": "done",
             "full_response": full_response,
-            "sql": _clean_sql_response(full_response),
+            "sql": _extract_sql(full_response, fences),
         }
         
     except requests.exceptions.Timeout:
@@ -149,12 +177,9 @@ def get_sql_from_llm_streaming(
     finally:
         if response:
             response.close()
-        if session:
-            session.close()
 
 
 def _build_prompt(user_query: str, schema_str: str) -> str:
-    from text2query.llm.prompts import DEFAULT_SQL_GENERATION_TEMPLATE
     return DEFAULT_SQL_GENERATION_TEMPLATE.format(
         schema=schema_str,
         query=user_query,
@@ -167,18 +192,66 @@ def _is_single_statement(sql: str) -> bool:
     return ";" not in stripped
 
 
+def _track_fences(token: str, pos: int, carry: str, fences: list[int]) -> str:
+    """Append offsets of the first two ``` in a streamed response to fences.
+
+    token starts at offset pos of the response; carry holds the last chars of
+    the previous tokens (as returned by the previous call), so fences split
+    across tokens are found without rescanning the response. Returns the new
+    carry.
+    """
+    window = carry + token
+    start = 0
+    while len(fences) < 2:
+        i = window.find("```", start)
+        if i == -1:
+            break
+        fences.append(pos - len(carry) + i)
+        start = i + 3
+    return window[max(start, len(window) - 2):]
+
+
+def _extract_sql(response: str, fences: list[int]) -> str | None:
+    """SQL of a streamed response; fences come from _track_fences during streaming."""
+    if len(fences) < 2:
+        return _clean_sql_response(response)
+    return _fenced_sql(response, fences[0], fences[1])
+
+
+def _fenced_sql(response: str, start: int, end: int) -> str | None:
+    """The statement between the ``` fences at start and end (an optional sql tag dropped)."""
+    body = response[start + 3:end]
+    if body[:3].lower() == "sql":
+        body = body[3:]
+    sql = body.strip()
+    return sql if _is_single_statement(sql) else None
+
+
 def _clean_sql_response(response: str) -> str | None:
     if not response:
         return None
 
-    match = re.search(r"```(?:sql)?\s*(.*?)```", response, re.DOTALL | re.IGNORECASE)
-    if match:
-        sql = match.group(1).strip()
-        return sql if _is_single_statement(sql) else None
+    # Plain finds rather than a lazy regex, so a response with an unclosed
+    # fence is scanned once.
+    start = response.find("```")
+    end = response.find("```", start + 3) if start != -1 else -1
+    if end != -1:
+        return _fenced_sql(response, start, end)
 
-    match = re.search(r"(SELECT|WITH)\s+.*?;", response, re.DOTALL | re.IGNORECASE)
+    # Bare SQL runs from the first SELECT/WITH to the next ';'. Keywords
+    # after the last ';' can't start one, so the search stops there.
+    end = response.rfind(";") + 1
+    match = None
+    if end:
+        # Searching a lowercased copy is much cheaper than IGNORECASE. The
+        # offsets line up unless some character lowercased to two (e.g. 'İ').
+        lower = response.lower()
+        if len(lower) == len(response):
+            match = _SQL_START_LOWER_RE.search(lower, 0, end)
+        else:
+            match = _SQL_START_RE.search(response, 0, end)
     if match:
-        sql = match.group(0).strip()
+        sql = response[match.start():response.find(";", match.end()) + 1].strip()
         return sql if _is_single_statement(sql) else None
 
     return None
@@ -0,0 +1,215 @@
+import struct
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from text2query.benchmark.data_loader import (
+    _StripTrailingPipe,
+    _binary_encoders,
+    _empty_on_failure,
+    _server_copy_works,
+    _encode_date,
+    _encode_numeric,
+    _prune_binary_cache,
+    _split_ranges,
+    _tbl_to_binary,
+)
+
+
+def _write_tbl(path, n_lines):
+    path.write_bytes(b"".join(f"{i}|row number {i}|\n".encode() for i in range(n_lines)))
+    return path.stat().st_size
+
+
+class TestSplitRanges:
+    def test_ranges_cover_file_contiguously(self, tmp_path):
+        tbl = tmp_path / "lineitem.tbl"
+        size = _write_tbl(tbl, 1000)
+        ranges = _split_ranges(tbl, size, 4)
+        assert len(ranges) == 4
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == size
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+
+    def test_ranges_end_on_line_boundaries(self, tmp_path):
+        tbl = tmp_path / "orders.tbl"
+        size = _write_tbl(tbl, 997)
+        data = tbl.read_bytes()
+        for start, end in _split_ranges(tbl, size, 7):
+            assert data[end - 1:end] == b"\n"
+            assert start == 0 or data[start - 1:start] == b"\n"
+
+    def test_fewer_lines_than_parts(self, tmp_path):
+        tbl = tmp_path / "region.tbl"
+        size = _write_tbl(tbl, 2)
+        ranges = _split_ranges(tbl, size, 8)
+        assert ranges[0][0] == 0 and ranges[-1][1] == size
+        assert len(ranges) <= 2
+
+    def test_single_part_is_whole_file(self, tmp_path):
+        tbl = tmp_path / "nation.tbl"
+        size = _write_tbl(tbl, 25)
+        assert _split_ranges(tbl, size, 1) == [(0, size)]
+
+
+class TestStripTrailingPipe:
+    def _read_all(self, path, chunk, limit=None, start=0):
+        with open(path, "rb") as f:
+            f.seek(start)
+            stream = _StripTrailingPipe(f, limit)
+            parts = []
+            while True:
+                data = stream.read(chunk)
+                if not data:
+                    break
+                parts.append(data)
+        return b"".join(parts)
+
+    def test_strips_trailing_pipe(self, tmp_path):
+        tbl = tmp_path / "t.tbl"
+        tbl.write_bytes(b"1|a|\n2|b|\n")
+        assert self._read_all(tbl, 1024) == b"1|a\n2|b\n"
+
+    def test_pipe_at_chunk_boundary(self, tmp_path):
+        tbl = tmp_path / "t.tbl"
+        tbl.write_bytes(b"1|a|\n22|bb|\n333|ccc|\n")
+        for chunk in range(1, 12):
+            assert self._read_all(tbl, chunk) == b"1|a\n22|bb\n333|ccc\n"
+
+    def test_keeps_inner_pipes(self, tmp_path):
+        tbl = tmp_path / "t.tbl"
+        tbl.write_bytes(b"1||x|\n")
+        assert self._read_all(tbl, 3) == b"1||x\n"
+
+    def test_last_line_without_newline(self, tmp_path):
+        tbl = tmp_path / "t.tbl"
+        tbl.write_bytes(b"1|a|\n2|b|")
+        assert self._read_all(tbl, 4) == b"1|a\n2|b"
+
+    def test_limited_range(self, tmp_path):
+        tbl = tmp_path / "t.tbl"
+        tbl.write_bytes(b"1|a|\n2|b|\n3|c|\n")
+        assert self._read_all(tbl, 2, limit=5, start=5) == b"2|b\n"
+
+
+class TestBinaryCopy:
+    def test_numeric_encoding(self):
+        assert _encode_numeric(b"123456.78") == struct.pack(">hhHH3h", 3, 1, 0, 2, 12, 3456, 7800)
+        assert _encode_numeric(b"-0.05") == struct.pack(">hhHH1h", 1, -1, 0x4000, 2, 500)
+        assert _encode_numeric(b"0.00") == struct.pack(">hhHH", 0, 0, 0, 2)
+        assert _encode_numeric(b"10000") == struct.pack(">hhHH1h", 1, 1, 0, 0, 1)
+
+    def test_date_encoding(self):
+        assert _encode_date(b"2000-01-01") == struct.pack(">i", 0)
+        assert _encode_date(b"1999-12-31") == struct.pack(">i", -1)
+
+    def test_tbl_to_binary_layout(self, tmp_path):
+        tbl = tmp_path / "region.tbl"
+        tbl.write_bytes(b"1|AFRICA|\n2||\n")
+        encoders = [lambda v: struct.pack(">i", int(v)), bytes]
+        bin_path = _tbl_to_binary(tbl, encoders)
+        data = bin_path.read_bytes()
+        assert data.startswith(b"PGCOPY\n\xff\r\n\x00")
+        body = data[19:]
+        expected = (
+            struct.pack(">hi", 2, 4) + struct.pack(">i", 1) + struct.pack(">i", 6) + b"AFRICA"
+            + struct.pack(">hi", 2, 4) + struct.pack(">i", 2) + struct.pack(">i", -1)
+            + struct.pack(">h", -1)
+        )
+        assert body == expected
+
+    def test_tbl_to_binary_reuses_cache(self, tmp_path):
+        tbl = tmp_path / "nation.tbl"
+        tbl.write_bytes(b"1|x|\n")
+        first = _tbl_to_binary(tbl, [bytes, bytes])
+        first.write_bytes(b"cached")
+        assert _tbl_to_binary(tbl, [bytes, bytes]).read_bytes() == b"cached"
+
+
+    def test_tbl_to_binary_rejects_wrong_field_count(self, tmp_path):
+        tbl = tmp_path / "nation.tbl"
+        tbl.write_bytes(b"1|x|\n2|\n")
+        with pytest.raises(ValueError, match="line 2: 1 fields, expected 2"):
+            _tbl_to_binary(tbl, [bytes, bytes])
+        assert list(tmp_path.iterdir()) == [tbl]
+
+    def test_encoders_match_narrow_types(self):
+        engine = create_engine("sqlite://")
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE t (a SMALLINT, b REAL)"))
+            conn.execute(text("CREATE TABLE u (a FLOAT)"))
+
+        small, real = _binary_encoders(engine, "t")
+        assert small(b"7") == struct.pack(">h", 7)
+        assert real(b"1.5") == struct.pack(">f", 1.5)
+        with pytest.raises(ValueError, match="No binary COPY encoder"):
+            _binary_encoders(engine, "u")
+
+    def test_prune_removes_stale_ranges(self, tmp_path):
+        tbl = tmp_path / "orders.tbl"
+        for name in ("orders.tbl.bin", "orders.tbl.0-50.bin", "orders.tbl.50-100.bin",
+                     "orders.tbl.0-100.bin", "orders.tbl.0-100.bin.tmp"):
+            (tmp_path / name).write_bytes(b"")
+
+        _prune_binary_cache(tbl, [(0, 50), (50, 100)])
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "orders.tbl.0-100.bin.tmp", "orders.tbl.0-50.bin", "orders.tbl.50-100.bin",
+        ]
+
+
+class TestEmptyOnFailure:
+    def test_truncates_tables_and_reraises(self):
+        engine = MagicMock()
+        conn = engine.begin.return_value.__enter__.return_value
+
+        with pytest.raises(RuntimeError, match="rebuild failed"):
+            with _empty_on_failure(engine):
+                raise RuntimeError("rebuild failed")
+
+        sql = str(conn.execute.call_args[0][0])
+        assert sql.startswith("TRUNCATE TABLE region, nation")
+
+    def test_interrupt_truncates_tables(self):
+        engine = MagicMock()
+
+        with pytest.raises(KeyboardInterrupt):
+            with _empty_on_failure(engine):
+                raise KeyboardInterrupt
+
+        engine.begin.assert_called_once()
+
+    def test_success_leaves_tables(self):
+        engine = MagicMock()
+
+        with _empty_on_failure(engine):
+            pass
+
+        engine.begin.assert_not_called()
+
+
+class TestServerCopyWorks:
+    def _engine(self, cursor):
+        engine = MagicMock()
+        conn = engine.connect.return_value.__enter__.return_value
+        conn.connection.cursor.return_value = cursor
+        return engine, conn
+
+    def test_trial_copy_is_rolled_back(self, tmp_path):
+        cursor = MagicMock()
+        engine, conn = self._engine(cursor)
+
+        assert _server_copy_works(engine, tmp_path, "/tpch/data", None)
+        sql = cursor.execute.call_args[0][0]
+        assert sql.startswith("COPY _copy_probe FROM PROGRAM")
+        assert "/tpch/data/region.tbl" in sql
+        conn.begin.return_value.__enter__.return_value.rollback.assert_called_once()
+
+    def test_server_error_disables_server_copy(self, tmp_path):
+        cursor = MagicMock()
+        cursor.execute.side_effect = Exception('could not open file "/tpch/data/region.tbl"')
+        engine, _ = self._engine(cursor)
+
+        assert not _server_copy_works(engine, tmp_path, "/tpch/data", None)
@@ -0,0 +1,80 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from text2query.database.executor import SYNTAX_ERROR, execute_sql_to_csv
+
+
+def _engine_with_cursor(cursor):
+    engine = MagicMock()
+    engine.raw_connection.return_value.cursor.return_value.__enter__.return_value = cursor
+    return engine
+
+
+class TestExecuteSqlToCsv:
+    def test_streams_copy_output(self, tmp_path):
+        cursor = MagicMock()
+        cursor.copy_expert.side_effect = lambda sql, f: f.write(b"a\n1\n2\n")
+        cursor.rowcount = 2
+        path = tmp_path / "01.csv"
+
+        assert execute_sql_to_csv(_engine_with_cursor(cursor), "SELECT 1 AS a;", path) == 2
+        assert path.read_text() == "a\n1\n2\n"
+        copy_sql = cursor.copy_expert.call_args[0][0]
+        assert copy_sql.startswith("COPY (SELECT * FROM (\nSELECT 1 AS a\n) AS _q LIMIT")
+
+    def test_falls_back_when_copy_fails(self, tmp_path):
+        error = Exception("syntax error")
+        error.pgcode = SYNTAX_ERROR
+        cursor = MagicMock()
+        cursor.copy_expert.side_effect = error
+        path = tmp_path / "01.csv"
+
+        with patch("text2query.database.executor.execute_sql_query",
+                   return_value=pd.DataFrame({"a": [1]})):
+            assert execute_sql_to_csv(_engine_with_cursor(cursor), "SELECT 1 AS a", path) == 1
+        assert path.read_text() == "a\n1\n"
+
+    def test_fallback_error_leaves_no_file(self, tmp_path):
+        cursor = MagicMock()
+        cursor.copy_expert.side_effect = Exception("syntax error")
+        path = tmp_path / "01.csv"
+
+        with patch("text2query.database.executor.execute_sql_query", return_value="bad query"):
+            assert execute_sql_to_csv(_engine_with_cursor(cursor), "DROP TABLE x", path) == "bad query"
+        assert not path.exists()
+
+    def test_query_error_is_not_retried(self, tmp_path):
+        error = Exception('relation "x" does not exist\n')
+        error.pgcode = "42P01"
+        cursor = MagicMock()
+        cursor.copy_expert.side_effect = error
+        path = tmp_path / "01.csv"
+
+        with patch("text2query.database.executor.execute_sql_query") as fallback:
+            result = execute_sql_to_csv(_engine_with_cursor(cursor), "SELECT * FROM x", path)
+        assert result == 'relation "x" does not exist'
+        assert not path.exists()
+        fallback.assert_not_called()
+
+    def test_timeout_is_not_retried(self, tmp_path):
+        error = Exception("canceling statement due to statement timeout\n")
+        error.pgcode = "57014"  # query_canceled
+        cursor = MagicMock()
+        cursor.copy_expert.side_effect = error
+
+        with patch("text2query.database.executor.execute_sql_query") as fallback:
+            result = execute_sql_to_csv(_engine_with_cursor(cursor), "SELECT 1", tmp_path / "01.csv")
+        assert result == "canceling statement due to statement timeout"
+        fallback.assert_not_called()
+
+    def test_reuses_given_connection(self, tmp_path):
+        cursor = MagicMock()
+        cursor.rowcount = 0
+        engine = MagicMock()
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value = cursor
+
+        assert execute_sql_to_csv(engine, "SELECT 1", tmp_path / "01.csv", conn=conn) == 0
+        engine.raw_connection.assert_not_called()
+        conn.close.assert_not_called()
@@ -0,0 +1,53 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+from text2query.llm import service
+from text2query.llm.service import get_sql_from_llm_streaming
+
+
+def _stream(*tokens, done=True):
+    lines = [json.dumps({"response": t, "done": False}).encode() for t in tokens]
+    if done:
+        lines.append(json.dumps({"response": "", "done": True}).encode())
+    response = MagicMock(status_code=200)
+    response.iter_lines.return_value = iter(lines)
+    return response
+
+
+def test_done_event_carries_sql_split_across_tokens():
+    response = _stream("``", "`sql\nSELECT 1", "\n`", "``")
+    with patch("text2query.llm.service._session") as session:
+        session.post.return_value = response
+        events = list(get_sql_from_llm_streaming("q", "schema", "m"))
+
+    assert [e["type"] for e in events] == ["token"] * 4 + ["done"]
+    assert events[-1]["sql"] == "SELECT 1"
+    assert events[-1]["full_response"] == "```sql\nSELECT 1\n```"
+
+
+def test_text_after_closing_fence_is_ignored():
+    response = _stream("```sql\nSELECT 1\n```", "\nAlso try ```SELECT 2```")
+    with patch("text2query.llm.service._session") as session, \
+         patch("text2query.llm.service._track_fences", wraps=service._track_fences) as track:
+        session.post.return_value = response
+        events = list(get_sql_from_llm_streaming("q", "schema", "m"))
+
+    assert events[-1]["sql"] == "SELECT 1"
+    assert track.call_count == 1
+
+
+def test_stop_reports_immediately_and_aborts_in_background():
+    response = _stream("SELECT", " 1", done=False)
+    stop = threading.Event()
+    with patch("text2query.llm.service._session") as session, \
+         patch("text2query.llm.service._abort_pool") as pool:
+        session.post.return_value = response
+        events = []
+        for event in get_sql_from_llm_streaming("q", "schema", "m", stop_event=stop):
+            events.append(event)
+            stop.set()
+
+    assert events[-1] == {"type": "stopped", "partial_response": "SELECT"}
+    pool.submit.assert_called_once()
+    assert pool.submit.call_args.args[1] == "m"
@@ -1,9 +1,10 @@
 """Tests for multi-seed and multi-model benchmark functionality."""
 import csv
+import os
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from text2query.benchmark.runner import run_llm_generation, execute_generated_queries
+from text2query.benchmark.runner import run_llm_generation, execute_generated_queries, _read_question
 from text2query.benchmark.reporting import (
     _format_summary_multiseed, _format_per_query_multiseed, _compute_stats,
     archive_session, model_slug, generate_cross_model_report, generate_reports,
@@ -101,6 +102,103 @@ def test_run_llm_generation_caching_per_seed(tmp_path):
     assert (output_dir / "seed_2" / "01.sql").exists()
 
 
+def test_run_llm_generation_parallel_results_ordered(tmp_path):
+    """Questions generated concurrently still come back sorted by query id."""
+    questions_dir = tmp_path / "questions"
+    output_dir = tmp_path / "output"
+    questions_dir.mkdir()
+    for qid in ("03", "01", "02"):
+        _make_question_file(questions_dir, qid, f"Question {qid}?")
+    (questions_dir / "04.md").write_text("no question here\n")
+
+    def mock_streaming(question, *args, **kwargs):
+        if question.endswith("02?"):
+            yield {"type": "error", "message": "boom"}
+        else:
+            yield {"type": "done", "sql": "SELECT 1;"}
+
+    with patch("text2query.benchmark.runner.get_sql_from_llm_streaming", side_effect=mock_streaming), \
+         patch("text2query.benchmark.runner.create_engine_for_database"), \
+         patch("text2query.benchmark.runner.get_database_schema_string", return_value="schema"):
+
+        results = run_llm_generation(questions_dir, output_dir, "db://url", "test-model")
+
+    assert [r["query_id"] for r in results] == ["01", "02", "03"]
+    assert [r["status"] for r in results] == ["success", "error", "success"]
+    assert (output_dir / "02.raw").read_text() == "ERROR: boom\n"
+
+
+def test_run_llm_generation_stopped_stream_is_not_cached(tmp_path):
+    """An interrupted stream leaves no .sql/.raw, so a rerun regenerates it."""
+    questions_dir = tmp_path / "questions"
+    output_dir = tmp_path / "output"
+    questions_dir.mkdir()
+    _make_question_file(questions_dir, "01", "What are the customer names?")
+
+    def mock_streaming(*args, stop_event=None, **kwargs):
+        assert stop_event is not None and not stop_event.is_set()
+        yield {"type": "stopped", "partial_response": "SEL"}
+
+    with patch("text2query.benchmark.runner.get_sql_from_llm_streaming", side_effect=mock_streaming), \
+         patch("text2query.benchmark.runner.create_engine_for_database"), \
+         patch("text2query.benchmark.runner.get_database_schema_string", return_value="schema"):
+
+        results = run_llm_generation(questions_dir, output_dir, "db://url", "test-model")
+
+    assert results == [{"query_id": "01", "status": "error", "error": "Interrupted"}]
+    assert not list(output_dir.iterdir())
+
+
+def test_run_llm_generation_executes_as_generated(tmp_path):
+    """With answers_dir, each successful query is executed into its seed's answers dir."""
+    questions_dir = tmp_path / "questions"
+    output_dir = tmp_path / "output"
+    answers_dir = tmp_path / "answers"
+    questions_dir.mkdir()
+    _make_question_file(questions_dir, "01", "What are the customer names?")
+    _make_question_file(questions_dir, "02", "How many orders?")
+
+    def mock_streaming(question, *args, **kwargs):
+        if question.startswith("How many"):
+            yield {"type": "error", "message": "boom"}
+        else:
+            yield {"type": "done", "sql": "SELECT name FROM customers;"}
+
+    def mock_execute(engine, query_file, out_dir, write_error_csv):
+        (out_dir / f"{query_file.stem}.csv").write_text("name\nx\n")
+        return {"query_id": query_file.stem, "status": "success", "rows": 1}
+
+    with patch("text2query.benchmark.runner.get_sql_from_llm_streaming", side_effect=mock_streaming), \
+         patch("text2query.benchmark.runner.create_engine_for_database"), \
+         patch("text2query.benchmark.runner.execute_query_to_csv", side_effect=mock_execute) as execute:
+
+        results = run_llm_generation(
+            questions_dir, output_dir, "db://url", "test-model",
+            seeds=[1, 2], schema="schema", answers_dir=answers_dir,
+        )
+
+    assert execute.call_count == 2
+    assert (answers_dir / "seed_1" / "01.csv").exists()
+    assert (answers_dir / "seed_2" / "01.csv").exists()
+    assert not (answers_dir / "seed_1" / "02.csv").exists()
+    assert all(r["execution"]["status"] == "success" for r in results if r["query_id"] == "01")
+
+
+def test_read_question_reparses_only_changed_files(tmp_path):
+    """Questions are parsed once per file version and re-read when the file changes."""
+    _make_question_file(tmp_path, "01", "First?")
+    qfile = tmp_path / "01.md"
+    assert _read_question(qfile) == "First?"
+
+    with patch.object(Path, "read_text", side_effect=AssertionError("re-read")):
+        assert _read_question(qfile) == "First?"
+
+    _make_question_file(tmp_path, "01", "Second?")
+    stat = qfile.stat()
+    os.utime(qfile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _read_question(qfile) == "Second?"
+
+
 def test_format_summary_multiseed():
     """Summary format should include mean±std, CI columns, and per-query seeds-ok count."""
     aggregated = [
@@ -251,6 +349,29 @@ def test_query_id_filter_reporting(tmp_path):
     assert not (report_dir / "per_query" / "02.md").exists()
 
 
+def test_reporting_uses_known_exec_errors(tmp_path):
+    """Errors from this run's execution are scored without reading the answer CSV."""
+    dirs = [tmp_path / d for d in ("ref_queries", "ref_answers", "gen_queries", "gen_answers")]
+    ref_queries, ref_answers, gen_queries, gen_answers = dirs
+    for d in dirs:
+        d.mkdir()
+    (ref_queries / "01.sql").write_text("SELECT 1;")
+    (ref_answers / "01.csv").write_text("col\n1\n")
+    (gen_queries / "01.sql").write_text("SELECT x;")
+
+    _, results = generate_reports(
+        generated_queries_dir=gen_queries,
+        reference_queries_dir=ref_queries,
+        generated_answers_dir=gen_answers,
+        reference_answers_dir=ref_answers,
+        report_dir=tmp_path / "report",
+        exec_errors={(None, "01"): 'column "x" does not exist'},
+    )
+
+    assert results[0]["status"] == "exec_error"
+    assert results[0]["error_category"] == "SchemaMismatch"
+
+
 # --- Multi-model tests ---
 
 def test_cross_model_csv_export(tmp_path):
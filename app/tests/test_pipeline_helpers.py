@@ -1,6 +1,16 @@
 from pathlib import Path
 
-from text2query.benchmark.pipeline import _parse_schema_sql
+from unittest.mock import MagicMock, patch
+
+from text2query.benchmark.pipeline import (
+    INDEX_TUNING,
+    _build_index,
+    _write_error_csv,
+    _parse_schema_sql,
+    execute_queries_to_csv,
+    invalidate_stale_answers,
+    load_schema_string,
+)
 
 import pytest
 
@@ -20,6 +30,15 @@ class TestParseSchemaSQL:
         assert len(stmts) == 1
         assert "--" not in stmts[0]
 
+    def test_strips_block_comments_and_keeps_literals(self, tmp_path):
+        schema = tmp_path / "schema.sql"
+        schema.write_text(
+            "/* header; with a semicolon */\n"
+            "CREATE TABLE t (x TEXT DEFAULT '--not a comment'); -- trailing\n"
+        )
+        stmts = _parse_schema_sql(schema)
+        assert stmts == ["CREATE TABLE t (x TEXT DEFAULT '--not a comment')"]
+
     def test_missing_file_raises(self):
         with pytest.raises(FileNotFoundError):
             _parse_schema_sql(Path("/no/such/file.sql"))
@@ -31,3 +50,120 @@ class TestParseSchemaSQL:
         assert len(stmts) == 1
 
 
+class TestBuildIndex:
+    def test_runs_statement_in_own_tuned_transaction(self):
+        engine = MagicMock()
+        conn = engine.begin.return_value.__enter__.return_value
+        stmt = "CREATE INDEX IF NOT EXISTS a ON lineitem (l_orderkey)"
+
+        _build_index(engine, stmt)
+
+        engine.begin.assert_called_once()
+        executed = [str(c.args[0]) for c in conn.execute.call_args_list]
+        assert executed[:-1] == [
+            f"SET LOCAL {name} = '{value}'" for name, value in INDEX_TUNING.items()
+        ]
+        assert executed[-1] == stmt
+
+
+class TestLoadSchemaString:
+    def test_second_call_reads_cache(self, tmp_path):
+        schema_file = tmp_path / "schema.sql"
+        schema_file.write_text("CREATE TABLE t (x INT);")
+        cache_dir = tmp_path / "cache"
+
+        with patch("text2query.benchmark.pipeline.create_engine_for_database"), \
+             patch("text2query.benchmark.pipeline.get_database_schema_string",
+                   return_value="Table 't': x (INTEGER)") as fetch:
+            first = load_schema_string("postgresql://u:pw@db:5432/tpch", schema_file, cache_dir)
+            second = load_schema_string("postgresql://u:pw@db:5432/tpch", schema_file, cache_dir)
+
+        assert first == second == "Table 't': x (INTEGER)"
+        assert fetch.call_count == 1
+
+    def test_key_ignores_credentials(self, tmp_path):
+        schema_file = tmp_path / "schema.sql"
+        schema_file.write_text("CREATE TABLE t (x INT);")
+        cache_dir = tmp_path / "cache"
+
+        with patch("text2query.benchmark.pipeline.create_engine_for_database"), \
+             patch("text2query.benchmark.pipeline.get_database_schema_string",
+                   return_value="schema") as fetch:
+            load_schema_string("postgresql://u:old@db:5432/tpch", schema_file, cache_dir)
+            load_schema_string("postgresql://u:new@db:5432/tpch", schema_file, cache_dir)
+            load_schema_string("postgresql://u:new@db:5432/other", schema_file, cache_dir)
+
+        assert fetch.call_count == 2
+
+    def test_schema_change_invalidates_cache(self, tmp_path):
+        schema_file = tmp_path / "schema.sql"
+        cache_dir = tmp_path / "cache"
+
+        with patch("text2query.benchmark.pipeline.create_engine_for_database"), \
+             patch("text2query.benchmark.pipeline.get_database_schema_string",
+                   side_effect=["old", "new"]):
+            schema_file.write_text("CREATE TABLE t (x INT);")
+            assert load_schema_string("postgresql://u:pw@db:5432/tpch", schema_file, cache_dir) == "old"
+            schema_file.write_text("CREATE TABLE t (x INT, y INT);")
+            assert load_schema_string("postgresql://u:pw@db:5432/tpch", schema_file, cache_dir) == "new"
+
+
+class TestExecuteQueriesToCsv:
+    def test_worker_reuses_connection_until_an_error(self, tmp_path):
+        files = []
+        for qid in ("01", "02", "03"):
+            (tmp_path / f"{qid}.sql").write_text("SELECT 1")
+            files.append(tmp_path / f"{qid}.sql")
+        engine = MagicMock()
+        engine.raw_connection.side_effect = lambda: MagicMock()
+
+        with patch("text2query.benchmark.pipeline.QUERY_WORKERS", 1), \
+             patch("text2query.benchmark.pipeline.create_engine_for_database", return_value=engine), \
+             patch("text2query.benchmark.pipeline.execute_sql_to_csv",
+                   side_effect=[1, "boom", 1]) as run_sql:
+            results = execute_queries_to_csv(files, tmp_path / "out", "postgresql://u:pw@db:5432/tpch")
+
+        assert [r["status"] for r in results] == ["success", "error", "success"]
+        conns = [c.kwargs["conn"] for c in run_sql.call_args_list]
+        assert conns[0] is conns[1] and conns[2] is not conns[0]
+        assert engine.raw_connection.call_count == 2
+        conns[0].invalidate.assert_called_once()
+        conns[0].close.assert_not_called()
+        conns[2].close.assert_called_once()
+
+    def test_quiet_prints_only_summary(self, tmp_path, capsys):
+        (tmp_path / "01.sql").write_text("SELECT 1")
+
+        with patch("text2query.benchmark.pipeline.create_engine_for_database"), \
+             patch("text2query.benchmark.pipeline.execute_sql_to_csv", return_value=1):
+            execute_queries_to_csv([tmp_path / "01.sql"], tmp_path / "out", "db", quiet=True)
+
+        out = capsys.readouterr().out
+        assert "[1/1]" not in out
+        assert "Executed 1 queries" in out
+
+
+class TestInvalidateStaleAnswers:
+    def test_removes_answers_without_current_format(self, tmp_path):
+        (tmp_path / "seed_1").mkdir()
+        (tmp_path / "01.csv").write_text("flag\nTrue\n")
+        (tmp_path / "seed_1" / "01.csv").write_text("flag\nTrue\n")
+
+        invalidate_stale_answers(tmp_path)
+        (tmp_path / "02.csv").write_text("flag\nt\n")
+        invalidate_stale_answers(tmp_path)
+
+        assert sorted(p.name for p in tmp_path.rglob("*.csv")) == ["02.csv"]
+
+
+class TestWriteErrorCsv:
+    def test_multiline_message_round_trips_through_report_parsing(self, tmp_path):
+        from text2query.benchmark.similarity import _result_set_comparison
+
+        path = tmp_path / "01.csv"
+        _write_error_csv(path, 'relation "x" does not exist\nLINE 1: SELECT a, b FROM x')
+
+        assert path.read_text().startswith("ERROR\n\"relation \"\"x\"\"")
+        status, *_, detail = _result_set_comparison(tmp_path / "gt.csv", path)
+        assert status == "exec_error"
+        assert "does not exist" in detail
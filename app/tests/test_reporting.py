@@ -1,6 +1,6 @@
 from text2query.benchmark.reporting import (
     _format_per_query_similarity, _format_summary_similarity,
-    _compute_stats, archive_session,
+    _compute_stats, archive_session, _move_dir,
 )
 
 
@@ -106,3 +106,37 @@ def test_archive_empty_dirs(tmp_path):
     session_dir = archive_session(queries, answers, report, results_base)
     assert session_dir.exists()
     assert (session_dir / "queries").exists()
+
+
+def test_move_dir_merges_into_existing_destination(tmp_path):
+    src = tmp_path / "report"
+    dst = tmp_path / "session" / "report"
+    (src / "per_query").mkdir(parents=True)
+    (src / "summary.md").write_text("summary")
+    (src / "per_query" / "01.md").write_text("q1")
+    dst.mkdir(parents=True)
+    (dst / "old.md").write_text("old")
+
+    _move_dir(src, dst, "reports")
+
+    assert not src.exists()
+    assert (dst / "summary.md").read_text() == "summary"
+    assert (dst / "per_query" / "01.md").exists()
+    assert (dst / "old.md").exists()
+
+
+def test_move_dir_hardlinks_when_merging(tmp_path):
+    src = tmp_path / "answers"
+    dst = tmp_path / "session" / "answers"
+    src.mkdir()
+    (src / "01.csv").write_text("new")
+    dst.mkdir(parents=True)
+    (dst / "01.csv").write_text("old")
+    (dst / "02.csv").write_text("keep")
+    inode = (src / "01.csv").stat().st_ino
+
+    _move_dir(src, dst, "answers")
+
+    assert (dst / "01.csv").read_text() == "new"
+    assert (dst / "01.csv").stat().st_ino == inode
+    assert (dst / "02.csv").exists()
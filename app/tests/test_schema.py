@@ -0,0 +1,62 @@
+import time
+from unittest.mock import patch
+
+from sqlalchemy import create_engine, text
+
+from text2query.database.schema import (
+    SCHEMA_CACHE_TTL,
+    close_all_engines,
+    create_engine_for_database,
+    get_database_schema_string,
+    invalidate_schema_cache,
+)
+
+
+def test_schema_string_is_cached_per_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'a.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE region (r_regionkey INTEGER, r_name TEXT)"))
+
+    first = get_database_schema_string(engine)
+    assert first == "Table 'region': r_regionkey (INTEGER), r_name (TEXT)"
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE nation (n_nationkey INTEGER)"))
+    assert get_database_schema_string(engine) == first
+
+    other = create_engine(f"sqlite:///{tmp_path / 'b.db'}")
+    assert get_database_schema_string(other) == ""
+
+
+def test_schema_string_refreshes_after_invalidate_or_ttl(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'c.db'}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE region (r_regionkey INTEGER PRIMARY KEY)"))
+    get_database_schema_string(engine)
+
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE nation (n_nationkey INTEGER, "
+            "n_regionkey INTEGER REFERENCES region (r_regionkey))"
+        ))
+    invalidate_schema_cache(engine)
+    assert get_database_schema_string(engine) == (
+        "Table 'nation': n_nationkey (INTEGER), n_regionkey (INTEGER). "
+        "FK(n_regionkey) -> region\n"
+        "Table 'region': r_regionkey (INTEGER)"
+    )
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE nation"))
+    later = time.monotonic() + SCHEMA_CACHE_TTL
+    with patch("text2query.database.schema.time.monotonic", return_value=later):
+        assert get_database_schema_string(engine) == "Table 'region': r_regionkey (INTEGER)"
+
+
+def test_engines_are_shared_until_closed(tmp_path):
+    url = f"sqlite:///{tmp_path / 'd.db'}"
+    engine = create_engine_for_database(url)
+    assert create_engine_for_database(url) is engine
+
+    close_all_engines()
+    assert create_engine_for_database(url) is not engine
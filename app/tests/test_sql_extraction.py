@@ -1,5 +1,5 @@
 import pytest
-from text2query.llm.service import _clean_sql_response
+from text2query.llm.service import _clean_sql_response, _extract_sql, _track_fences
 
 
 def test_extracts_sql_from_fenced_block():
@@ -80,3 +80,39 @@ def test_string_literal_semicolon_falsely_rejected():
     # BUG: _is_single_statement sees the ; inside the string and rejects it.
     # This test documents the current (broken) behavior.
     assert _clean_sql_response(response) is None
+
+
+def test_bare_sql_ignores_keywords_after_last_semicolon():
+    response = "SELECT 1; " + "select more " * 5000
+    assert _clean_sql_response(response) == "SELECT 1;"
+
+
+def _stream_extract(response: str, size: int) -> str | None:
+    fences: list[int] = []
+    carry = ""
+    for i in range(0, len(response), size):
+        carry = _track_fences(response[i:i + size], i, carry, fences)
+    return _extract_sql(response, fences)
+
+
+@pytest.mark.parametrize("response", [
+    "Here's the query:\n```sql\nSELECT id FROM users\n```\nHope that helps.",
+    "```SQL\nSELECT 1\n```",
+    "```\nSELECT count(*) FROM orders\n```\nand ```more```",
+    "```sql\nSELECT 1; DROP TABLE users;\n```",
+    "```sql\nSELECT 1",
+    "Try this: SELECT name FROM customers WHERE id = 1;",
+])
+@pytest.mark.parametrize("size", [1, 2, 3, 7])
+def test_streamed_extraction_matches_full_parse(response, size):
+    assert _stream_extract(response, size) == _clean_sql_response(response)
+
+
+def test_bare_multiline_sql_ends_at_first_semicolon():
+    response = "Answer:\nWITH x AS (SELECT 1)\nSELECT * FROM x;\nThat's it; enjoy."
+    assert _clean_sql_response(response) == "WITH x AS (SELECT 1)\nSELECT * FROM x;"
+
+
+def test_bare_sql_keeps_original_case_and_offsets():
+    assert _clean_sql_response("İ says: select Name from T;") == "select Name from T;"
+    assert _clean_sql_response("Ok: With x AS (SELECT 1) SELECT * FROM x;") == "With x AS (SELECT 1) SELECT * FROM x;"
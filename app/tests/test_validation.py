@@ -1,6 +1,13 @@
 from pathlib import Path
+from unittest.mock import patch
 
+from sqlalchemy import create_engine, text
+
+from text2query.benchmark.data_loader import TPCH_TABLES
 from text2query.benchmark.validation import (
+    count_files,
+    check_database_ready,
+    list_stems,
     check_directory,
     check_data_cache,
     check_answers_completeness,
@@ -53,3 +60,39 @@ def test_answers_completeness_with_gap(tmp_path):
     complete, missing = check_answers_completeness(answers_dir, queries_dir)
     assert complete is False
     assert missing == {"03"}
+
+
+def test_count_files_matches_extension_only(tmp_path):
+    for n in ("01", "02"):
+        (tmp_path / f"{n}.sql").write_text("SELECT 1")
+    (tmp_path / "notes.md").write_text("x")
+    (tmp_path / "nested.sql").mkdir()
+    assert count_files(tmp_path, "sql") == 2
+
+
+def test_list_stems_sorted_files_only(tmp_path):
+    for n in ("10", "02", "01"):
+        (tmp_path / f"{n}.sql").write_text("SELECT 1")
+    (tmp_path / ".hidden.sql").write_text("x")
+    (tmp_path / "03.csv").write_text("x")
+    (tmp_path / "dir.sql").mkdir()
+    assert list_stems(tmp_path, "sql") == ["01", "02", "10"]
+    assert list_stems(tmp_path / "missing", "sql") == []
+
+
+def test_database_ready_needs_every_table_non_empty(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tpch.db'}")
+    with engine.begin() as conn:
+        for table in TPCH_TABLES:
+            conn.execute(text(f"CREATE TABLE {table} (id INTEGER)"))
+            if table != "lineitem":
+                conn.execute(text(f"INSERT INTO {table} VALUES (1)"))
+
+    with patch("text2query.database.schema.create_engine_for_database", return_value=engine):
+        assert check_database_ready("db://url") is False
+        with engine.begin() as conn:
+            conn.execute(text("INSERT INTO lineitem VALUES (1)"))
+        assert check_database_ready("db://url") is True
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE region"))
+        assert check_database_ready("db://url") is False